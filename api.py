@@ -1,9 +1,17 @@
+import fnmatch
 import json
 import os
+import re
 import glob as glob_module
 
 import webview
 
+try:
+    # SIMD-accelerated JSON parser; multi-KB track payloads from JS benefit
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
 from simulation.car import CarConfig
 from simulation.track import Track
 from training.config_bridge import ConfigBridge
@@ -20,28 +28,36 @@ TRACKS_DIR = os.path.join(BASE_DIR, "tracks")
 EXPORTS_DIR = os.path.join(BASE_DIR, "exports")
 CHECKPOINTS_DIR = os.path.join(BASE_DIR, "checkpoints")
 
+_NUM_INPUTS_RE = re.compile(r"(?m)^num_inputs\s*=\s*\d+")
+
 
 class Api:
     """Exposed to JavaScript via pywebview.api."""
 
     def __init__(self):
         self._window = None
+        # Data directories are created once here; per-call makedirs on the
+        # polled listing endpoints was a syscall per UI refresh.
+        for d in (TRACKS_DIR, EXPORTS_DIR, CHECKPOINTS_DIR):
+            os.makedirs(d, exist_ok=True)
         self._trainer = Trainer()
         self._race_manager = RaceManager()
         self._car_config = CarConfig.from_ini(CAR_CONFIG_PATH)
         self._current_track: Track | None = None
         self._current_track_name: str = ""
+        # Parsed .racer summaries keyed by (path, mtime); the UI polls
+        # list_racers, so unchanged files should skip the JSON parse.
+        self._racer_cache: dict[tuple[str, float], dict] = {}
 
     # === Track Editor ===
 
     def save_track(self, track_json: str) -> dict:
         """Save track to .track file."""
         try:
-            data = json.loads(track_json) if isinstance(track_json, str) else track_json
+            data = _loads(track_json) if isinstance(track_json, str) else track_json
             track = Track.from_json(data)
 
             # Use file dialog
-            os.makedirs(TRACKS_DIR, exist_ok=True)
             result = self._window.create_file_dialog(
                 webview.FileDialog.SAVE,
                 directory=TRACKS_DIR,
@@ -61,9 +77,8 @@ class Api:
     def save_track_data(self, track_json: str, filename: str) -> dict:
         """Save track data directly without file dialog."""
         try:
-            data = json.loads(track_json) if isinstance(track_json, str) else track_json
+            data = _loads(track_json) if isinstance(track_json, str) else track_json
             track = Track.from_json(data)
-            os.makedirs(TRACKS_DIR, exist_ok=True)
             filepath = os.path.join(TRACKS_DIR, filename)
             if not filepath.endswith(".track"):
                 filepath += ".track"
@@ -94,7 +109,6 @@ class Api:
 
     def list_tracks(self) -> list:
         """List saved tracks."""
-        os.makedirs(TRACKS_DIR, exist_ok=True)
         tracks = glob_module.glob(os.path.join(TRACKS_DIR, "*.track"))
         return [{"name": os.path.basename(t), "path": t} for t in sorted(tracks)]
 
@@ -169,7 +183,7 @@ class Api:
     def start_training(self, track_json: str) -> dict:
         """Start NEAT training."""
         try:
-            data = json.loads(track_json) if isinstance(track_json, str) else track_json
+            data = _loads(track_json) if isinstance(track_json, str) else track_json
             track = Track.from_json(data)
 
             # Validation
@@ -194,22 +208,21 @@ class Api:
 
     def _update_neat_num_inputs(self):
         """Update num_inputs in neat config based on car config (preserves comments)."""
-        import re
         with open(NEAT_CONFIG_PATH, "r") as f:
             content = f.read()
-        content = re.sub(
-            r"(?m)^num_inputs\s*=\s*\d+",
-            f"num_inputs = {self._car_config.num_inputs}",
-            content,
-        )
-        with open(NEAT_CONFIG_PATH, "w") as f:
-            f.write(content)
+        replacement = f"num_inputs = {self._car_config.num_inputs}"
+        new_content = _NUM_INPUTS_RE.sub(replacement, content)
+        # Skip the write when the value is already current: no disk churn,
+        # and no spurious reload for anything watching the config file.
+        if new_content != content:
+            with open(NEAT_CONFIG_PATH, "w") as f:
+                f.write(new_content)
 
     def resume_training(self, checkpoint_path: str, track_json: str = None) -> dict:
         """Resume from checkpoint."""
         try:
             if track_json:
-                data = json.loads(track_json) if isinstance(track_json, str) else track_json
+                data = _loads(track_json) if isinstance(track_json, str) else track_json
                 track = Track.from_json(data)
                 self._current_track = track
             if self._current_track is None:
@@ -250,20 +263,21 @@ class Api:
 
     def list_checkpoints(self) -> list:
         """List available checkpoints."""
-        os.makedirs(CHECKPOINTS_DIR, exist_ok=True)
         # Match both old format (neat-checkpoint-*) and new format (CarName-gen-*)
-        files = glob_module.glob(os.path.join(CHECKPOINTS_DIR, "*-gen-*"))
-        files += glob_module.glob(os.path.join(CHECKPOINTS_DIR, "neat-checkpoint-*"))
-        files = list(set(files))  # deduplicate
-        result = []
-        for f in sorted(files, key=os.path.getmtime, reverse=True):
-            name = os.path.basename(f)
-            result.append({
-                "name": name,
-                "path": f,
-                "modified": os.path.getmtime(f),
-            })
-        return result
+        # One scandir pass: entry.stat() comes from the directory read, so we
+        # avoid a separate stat() syscall per file for the mtime sort.
+        entries = [
+            e for e in os.scandir(CHECKPOINTS_DIR)
+            if e.is_file() and (
+                fnmatch.fnmatch(e.name, "*-gen-*")
+                or fnmatch.fnmatch(e.name, "neat-checkpoint-*")
+            )
+        ]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [
+            {"name": e.name, "path": e.path, "modified": e.stat().st_mtime}
+            for e in entries
+        ]
 
     # === Export ===
 
@@ -290,22 +304,36 @@ class Api:
 
     def list_racers(self) -> list:
         """List exported racers."""
-        os.makedirs(EXPORTS_DIR, exist_ok=True)
-        files = glob_module.glob(os.path.join(EXPORTS_DIR, "*.racer"))
+        entries = [
+            e for e in os.scandir(EXPORTS_DIR)
+            if e.is_file() and e.name.endswith(".racer")
+        ]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
         result = []
-        for f in sorted(files, key=os.path.getmtime, reverse=True):
-            try:
-                with open(f) as fh:
-                    data = json.load(fh)
-                result.append({
-                    "name": data.get("name", os.path.basename(f)),
-                    "path": f,
-                    "generation": data.get("generation"),
-                    "fitness": data.get("genome", {}).get("fitness"),
-                    "car_config": data.get("car_config", {}),
-                })
-            except Exception:
-                result.append({"name": os.path.basename(f), "path": f})
+        seen = set()
+        for e in entries:
+            key = (e.path, e.stat().st_mtime)
+            seen.add(key)
+            summary = self._racer_cache.get(key)
+            if summary is None:
+                try:
+                    with open(e.path, "rb") as fh:
+                        data = _loads(fh.read())
+                    summary = {
+                        "name": data.get("name", e.name),
+                        "path": e.path,
+                        "generation": data.get("generation"),
+                        "fitness": data.get("genome", {}).get("fitness"),
+                        "car_config": data.get("car_config", {}),
+                    }
+                except Exception:
+                    summary = {"name": e.name, "path": e.path}
+                self._racer_cache[key] = summary
+            result.append(summary)
+        # Drop cache entries for files that were removed or rewritten
+        for key in list(self._racer_cache):
+            if key not in seen:
+                del self._racer_cache[key]
         return result
 
     # === Race ===
@@ -313,11 +341,11 @@ class Api:
     def start_race(self, track_json: str, racer_paths: list, num_laps: int = 3) -> dict:
         """Start a race."""
         try:
-            data = json.loads(track_json) if isinstance(track_json, str) else track_json
+            data = _loads(track_json) if isinstance(track_json, str) else track_json
             track = Track.from_json(data)
             result = self._race_manager.load_race(track, racer_paths, num_laps)
             if result.get("success"):
-                self._race_manager.start()
+                self._race_manager.start(window=self._window)
             return result
         except Exception as e:
             return {"success": False, "error": str(e)}
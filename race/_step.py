@@ -0,0 +1,111 @@
+"""JIT-compiled per-tick race kernel.
+
+With all racers sharing one CarBatch the tick body is flat array arithmetic:
+steering/throttle integration, movement and the grass-mask lookup. That is a
+natural fit for Numba's nopython mode, so the whole step runs as one native
+loop instead of a dozen small NumPy dispatches. When numba is not installed
+the same function runs as plain Python — correct, just slower, and race
+fields are small (one slot per racer) so it stays usable.
+"""
+
+import math
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is optional
+    numba = None
+
+
+def _race_step_impl(
+    pos_x, pos_y, angles, velocity_angles, speeds, prev_speeds,
+    alive, crashed, total_distance, time_alive,
+    steering, throttle,
+    rotation_speed, acceleration, brake_force, max_speed, grip,
+    drift_enabled, road_mask, width, height, scale, dt,
+):
+    n = pos_x.shape[0]
+    for i in range(n):
+        if not alive[i]:
+            continue
+
+        prev_speeds[i] = speeds[i]
+        angles[i] += steering[i] * rotation_speed[i] * dt
+
+        if throttle[i] > 0.0:
+            accel = throttle[i] * acceleration[i]
+        elif throttle[i] < 0.0:
+            accel = throttle[i] * brake_force[i]
+        else:
+            accel = 0.0
+        s = speeds[i] + accel * dt
+        if s < 0.0:
+            s = 0.0
+        elif s > max_speed[i]:
+            s = max_speed[i]
+        speeds[i] = s
+
+        if drift_enabled:
+            angle_diff = angles[i] - velocity_angles[i]
+            velocity_angles[i] += angle_diff * grip[i]
+            move_angle = velocity_angles[i]
+        else:
+            velocity_angles[i] = angles[i]
+            move_angle = angles[i]
+
+        px = s * scale * dt
+        pos_x[i] += math.cos(move_angle) * px
+        pos_y[i] += math.sin(move_angle) * px
+        total_distance[i] += px
+        time_alive[i] += 1
+
+        ix = int(pos_x[i])
+        iy = int(pos_y[i])
+        if ix < 0 or ix >= width or iy < 0 or iy >= height or road_mask[iy, ix]:
+            alive[i] = False
+            crashed[i] = True
+
+
+if numba is not None:
+    race_step = numba.njit(cache=True, fastmath=True)(_race_step_impl)
+else:
+    race_step = _race_step_impl
+
+
+def warmup(batch, config, road_mask):
+    """Trigger JIT compilation outside the tick budget (no-op state change:
+    runs one step with dt=0 on dead dummy slots)."""
+    import numpy as np
+
+    n = 1
+    f32 = lambda: np.zeros(n, dtype=np.float32)  # noqa: E731 - dummy rows
+    race_step(
+        f32(), f32(), f32(), f32(), f32(), f32(),
+        np.zeros(n, dtype=bool), np.zeros(n, dtype=bool),
+        f32(), np.zeros(n, dtype=np.int32),
+        f32(), f32(),
+        np.ones(n), np.ones(n), np.ones(n), np.ones(n), np.ones(n),
+        bool(config.drift_enabled), road_mask,
+        road_mask.shape[1], road_mask.shape[0], 0.0, 0.0,
+    )
+    from simulation.checkpoint import segments_intersect_per_car
+
+    f64 = lambda: np.zeros(n)  # noqa: E731 - gathered gates are float64
+    segments_intersect_per_car(
+        f64(), f64(), f64(), f64(), f32(), f32(), f32(), f32(),
+        np.zeros(n, dtype=bool),
+    )
+    from simulation._track_nb import is_grass_kernel, raycast_kernel
+
+    if raycast_kernel is not None:
+        packed = np.packbits(road_mask, axis=1)
+        raycast_kernel(
+            packed, np.zeros(road_mask.shape, dtype=np.float32), f32(), f32(),
+            np.zeros((n, 1), dtype=np.float32), np.zeros((n, 1), dtype=np.float32),
+            1, 2.0, 1.0, road_mask.shape[1], road_mask.shape[0],
+            np.ones((n, 1), dtype=np.float32),
+        )
+        is_grass_kernel(
+            packed, f32(), f32(),
+            road_mask.shape[1], road_mask.shape[0],
+            np.zeros(n, dtype=np.bool_),
+        )
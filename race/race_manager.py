@@ -1,8 +1,21 @@
+import json
+import math
+import os
 import threading
 import time
 
 import numpy as np
 
+try:
+    from orjson import dumps as _orjson_dumps
+
+    def _dumps(obj) -> str:
+        return _orjson_dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+from race._step import race_step, warmup
 from simulation.car import CarBatch, CarConfig
 from simulation.track import Track
 from training.exporter import Exporter
@@ -14,6 +27,41 @@ RACER_COLORS = [
 ]
 
 
+class _StackedConfig:
+    """Per-racer CarConfig fields stacked into arrays.
+
+    Lets a single CarBatch.update call drive all racers at once even when
+    their physics parameters differ (NumPy broadcasts the arrays per slot).
+    Racers without drift get grip=1.0, which makes the drift code path
+    behave exactly like the rigid one (velocity angle snaps to heading).
+    """
+
+    def __init__(self, configs: list):
+        self.rotation_speed = np.array([c.rotation_speed for c in configs])
+        self.acceleration = np.array([c.acceleration for c in configs])
+        self.brake_force = np.array([c.brake_force for c in configs])
+        self.max_speed = np.array([c.max_speed for c in configs])
+        self.drift_enabled = any(c.drift_enabled for c in configs)
+        self.grip = np.array([c.grip if c.drift_enabled else 1.0 for c in configs])
+        # Reciprocals for the input normalization, mirroring CarConfig.
+        self._inv_max_speed = 1.0 / self.max_speed
+        self._inv_accel = 1.0 / np.maximum(self.acceleration, 1e-6)
+        # Sensor geometry is only shared when every racer agrees on it;
+        # callers must check `homogeneous_sensors` before using these.
+        self.ray_angles = configs[0].ray_angles
+        self.ray_length = configs[0].ray_length
+        self._ray_cos = configs[0]._ray_cos
+        self._ray_sin = configs[0]._ray_sin
+        self.homogeneous_sensors = all(
+            np.array_equal(c.ray_angles, configs[0].ray_angles)
+            and c.ray_length == configs[0].ray_length
+            and c.drift_enabled == configs[0].drift_enabled
+            for c in configs
+        )
+        if self.homogeneous_sensors:
+            self.drift_enabled = configs[0].drift_enabled
+
+
 class RaceManager:
     """Manages a race between exported models."""
 
@@ -22,17 +70,33 @@ class RaceManager:
         self.racers: list[dict] = []
         self.networks: list = []
         self.car_configs: list[CarConfig] = []
-        self.car_batches: list[CarBatch] = []
-        self.colors: list[str] = []
+        self.car_batch: CarBatch | None = None
+        self._stacked_config: _StackedConfig | None = None
+        self.colors: tuple[str, ...] = ()
         self.num_laps = 3
         self.results: list[dict] = []
         self.running = False
         self.finished = False
         self._thread: threading.Thread | None = None
-        self._lock = threading.Lock()
-        self._current_state: dict = {}
+        self._window = None
+        # Imported racers keyed by (path, mtime): racing a model against
+        # itself should not re-parse the file and rebuild the network.
+        # Networks are shared — activation is sequential and returns a copy.
+        self._racer_import_cache: dict[tuple[str, float], dict] = {}
+        # Double-buffered snapshots: the race thread fills the buffer the UI
+        # is not reading, then rebinds _snapshot — attribute rebinding is
+        # atomic under the GIL, so no lock is needed between the simulation
+        # and UI threads.
+        self._snap_a: dict | None = None
+        self._snap_b: dict | None = None
+        self._snapshot: dict | None = None
+        self._state_cache: tuple[int, dict] | None = None
         self._tick = 0
-        self._finish_times: dict[int, float] = {}
+        # Finish time per racer slot, NaN = not finished yet: dense array
+        # instead of a dict keeps the per-tick completion check vectorized
+        self._finish_times: np.ndarray = np.empty(0, dtype=np.float32)
+        self._steer_buf: np.ndarray | None = None
+        self._throttle_buf: np.ndarray | None = None
 
     def load_race(self, track: Track, racer_paths: list, num_laps: int = 3) -> dict:
         """Load track and racers for a race."""
@@ -42,24 +106,53 @@ class RaceManager:
             self.racers = []
             self.networks = []
             self.car_configs = []
-            self.car_batches = []
-            self.colors = []
+            self.colors = ()
             self.results = []
             self.finished = False
             self._tick = 0
-            self._finish_times = {}
-
-            for i, path in enumerate(racer_paths):
-                racer = Exporter.import_racer(path)
+            self._finish_times = np.full(len(racer_paths), np.nan, dtype=np.float32)
+            self._snapshot = None
+            self._state_cache = None
+            self._snap_a = None
+            self._snap_b = None
+
+            seen: set = set()
+            for path in racer_paths:
+                key = (path, os.path.getmtime(path))
+                seen.add(key)
+                racer = self._racer_import_cache.get(key)
+                if racer is None:
+                    racer = Exporter.import_racer(path)
+                    self._racer_import_cache[key] = racer
                 self.racers.append(racer)
                 self.networks.append(racer["network"])
                 self.car_configs.append(racer["car_config"])
+            # Drop stale entries (edited/removed files) from the cache.
+            for key in list(self._racer_import_cache):
+                if key not in seen:
+                    del self._racer_import_cache[key]
+
+            # Frozen once per race; name/color/drift are static metadata that
+            # the front end gets once from start_race, not on every tick.
+            self.colors = tuple(
+                RACER_COLORS[i % len(RACER_COLORS)] for i in range(len(self.racers))
+            )
 
-                batch = CarBatch()
-                batch.reset(1, track.start_pos, track.start_angle)
-                self.car_batches.append(batch)
-
-                self.colors.append(RACER_COLORS[i % len(RACER_COLORS)])
+            # One batch with a slot per racer: physics/collision runs once
+            # per tick over an N-vector instead of N single-car batches.
+            self.car_batch = CarBatch()
+            self.car_batch.reset(len(self.racers), track.start_pos, track.start_angle)
+            self._stacked_config = _StackedConfig(self.car_configs)
+
+            # Reused every tick; allocating fresh control arrays at 60 Hz is
+            # pure garbage for the allocator.
+            self._steer_buf = np.zeros(len(self.racers), dtype=np.float32)
+            self._throttle_buf = np.zeros(len(self.racers), dtype=np.float32)
+            # num_inputs is a derived property; resolve it once per race
+            # rather than per dead racer per tick.
+            self._zero_inputs = [
+                np.zeros(c.num_inputs, dtype=np.float32) for c in self.car_configs
+            ]
 
             return {
                 "success": True,
@@ -76,8 +169,11 @@ class RaceManager:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def start(self):
+    def start(self, window=None):
         """Launch race in thread."""
+        self._window = window
+        # Pay the JIT compile cost before the first tick
+        warmup(self.car_batch, self._stacked_config, self.track.road_mask)
         self.running = True
         self.finished = False
         self._thread = threading.Thread(target=self._race_thread, daemon=True)
@@ -86,53 +182,86 @@ class RaceManager:
     def _race_thread(self):
         """Main race loop."""
         try:
-            num_cps = len(self.track.checkpoints) if self.track.checkpoints else 1
+            batch = self.car_batch
+            config = self._stacked_config
+            n = len(self.racers)
+
+            # Drift-corrected 60 Hz cadence: each tick has a monotonic
+            # deadline, so short ticks sleep longer and long ticks eat into
+            # the next sleep instead of permanently lowering the tick rate.
+            tick_dt = 1.0 / 60.0
+            next_deadline = time.monotonic() + tick_dt
+            # State is published every other tick; the UI renders at most at
+            # display rate, so per-tick publishing only added lock traffic.
+            publish_interval = 2
 
             while self.running and not self.finished:
                 self._tick += 1
 
-                # Update each racer independently
-                for i in range(len(self.racers)):
-                    batch = self.car_batches[i]
-                    config = self.car_configs[i]
-
-                    if not batch.alive[0]:
-                        continue
-
-                    # Get NN inputs
-                    inputs = batch.get_nn_inputs(self.track, config)
-                    output = self.networks[i].activate(inputs[0].tolist())
-
-                    steering = np.array([np.tanh(output[0])])
-                    throttle = np.array([np.tanh(output[1])])
-
-                    batch.update(steering, throttle, config)
-                    batch.check_grass(self.track)
-                    batch.check_checkpoints(self.track.checkpoints)
-
-                # Check for race completion
-                all_done = True
-                for i, batch in enumerate(self.car_batches):
-                    if batch.alive[0] and batch.laps[0] >= self.num_laps:
-                        if i not in self._finish_times:
-                            self._finish_times[i] = self._tick / 60.0  # Approximate seconds
-                    if batch.alive[0] and i not in self._finish_times:
-                        all_done = False
+                # NN outputs per racer, written into the reusable buffers
+                # (math.tanh: scalar call, no ufunc dispatch)
+                inputs = self._nn_inputs()
+                steering = self._steer_buf
+                throttle = self._throttle_buf
+                for i in range(n):
+                    if batch.alive[i]:
+                        output = self.networks[i].activate(inputs[i])
+                        steering[i] = math.tanh(output[0])
+                        throttle[i] = math.tanh(output[1])
+
+                # Single fused physics + grass kernel for all racers
+                old_x = batch.pos_x.copy()
+                old_y = batch.pos_y.copy()
+                race_step(
+                    batch.pos_x, batch.pos_y, batch.angles, batch.velocity_angles,
+                    batch.speeds, batch.prev_speeds,
+                    batch.alive, batch.crashed,
+                    batch.total_distance, batch.time_alive,
+                    steering, throttle,
+                    config.rotation_speed, config.acceleration,
+                    config.brake_force, config.max_speed, config.grip,
+                    config.drift_enabled, self.track.road_mask,
+                    self.track.width, self.track.height,
+                    CarBatch.SPEED_SCALE, CarBatch.DT,
+                )
+                # race_step flips alive flags directly, bypassing the batch
+                # methods that maintain alive_count — resync it here.
+                batch.alive_count = int(np.count_nonzero(batch.alive))
+                batch.check_checkpoints_sweep(self.track, old_x, old_y)
+
+                # Check for race completion (vectorized, NaN = not finished)
+                just_finished = (
+                    batch.alive
+                    & (batch.laps >= self.num_laps)
+                    & np.isnan(self._finish_times)
+                )
+                self._finish_times[just_finished] = self._tick / 60.0  # Approximate seconds
+                all_done = bool(
+                    np.all(~np.isnan(self._finish_times) | ~batch.alive)
+                )
 
-                if not any(b.alive[0] for b in self.car_batches):
-                    all_done = True
+                if all_done:
+                    self.finished = True
 
-                # Update state
-                with self._lock:
-                    self._current_state = self._build_state()
+                # Publish a raw snapshot (throttled; final tick always
+                # publishes) — the formatted dict is built lazily by
+                # get_state only when the UI actually polls.
+                if all_done or self._tick % publish_interval == 0:
+                    self._publish_snapshot()
+                    # Push to JS so the front end pays no polling round-trip;
+                    # get_state stays available as a pull fallback.
+                    self._push_state(self._build_state(self._snapshot))
 
                 if all_done:
-                    self.finished = True
-                    with self._lock:
-                        self._current_state = self._build_state()
                     break
 
-                time.sleep(1.0 / 60.0)
+                next_deadline += tick_dt
+                sleep_for = next_deadline - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    # Fell far behind; rebase rather than bursting to catch up
+                    next_deadline = time.monotonic()
 
         except Exception as e:
             print(f"Race error: {e}")
@@ -141,59 +270,166 @@ class RaceManager:
         finally:
             self.running = False
 
-    def _build_state(self) -> dict:
+    def _nn_inputs(self) -> np.ndarray | list:
+        """Inputs for every racer's network.
+
+        When all racers share sensor geometry this is one vectorized
+        get_nn_inputs call over the whole batch; otherwise fall back to
+        per-racer raycasts (networks may even disagree on input width).
+        """
+        batch = self.car_batch
+        if self._stacked_config.homogeneous_sensors:
+            return batch.get_nn_inputs(self.track, self._stacked_config)
+
+        inputs = []
+        for i, config in enumerate(self.car_configs):
+            if not batch.alive[i]:
+                # Dead racers get a constant zero row, built once per race.
+                inputs.append(self._zero_inputs[i])
+                continue
+            rays = self.track.raycast_batch(
+                batch.pos_x[i:i + 1], batch.pos_y[i:i + 1], batch.angles[i:i + 1],
+                config.ray_angles, config.ray_length,
+                config._ray_cos, config._ray_sin,
+            )[0]
+            row = [
+                rays,
+                [batch.speeds[i] / config.max_speed],
+                [batch.angles[i] / math.pi],
+                [np.clip(
+                    (batch.speeds[i] - batch.prev_speeds[i]) / max(config.acceleration, 1e-6),
+                    -1.0, 1.0,
+                )],
+            ]
+            if config.drift_enabled:
+                row.append([np.clip(
+                    (batch.angles[i] - batch.velocity_angles[i]) / math.pi,
+                    -1.0, 1.0,
+                )])
+            inputs.append(np.hstack(row).astype(np.float32))
+        return inputs
+
+    def _make_snap_buffer(self) -> dict:
+        n = len(self.racers)
+        return {
+            "tick": 0,
+            "finished": False,
+            "pos_x": np.zeros(n, dtype=np.float64),
+            "pos_y": np.zeros(n, dtype=np.float64),
+            "angles": np.zeros(n, dtype=np.float64),
+            "velocity_angles": np.zeros(n, dtype=np.float64),
+            "alive": np.ones(n, dtype=bool),
+            "laps": np.zeros(n, dtype=np.int32),
+            "checkpoint_progress": np.zeros(n, dtype=np.int32),
+            "total_checkpoints": np.zeros(n, dtype=np.int32),
+            "finish_times": np.full(n, np.nan, dtype=np.float32),
+        }
+
+    def _publish_snapshot(self):
+        """Copy the mutable per-tick arrays into the buffer the UI is not
+        reading, then atomically swap it in. No dict/array allocation and no
+        lock on the simulation thread."""
+        if self._snap_a is None:
+            self._snap_a = self._make_snap_buffer()
+            self._snap_b = self._make_snap_buffer()
+        buf = self._snap_b if self._snapshot is self._snap_a else self._snap_a
+
+        batch = self.car_batch
+        buf["tick"] = self._tick
+        buf["finished"] = self.finished
+        np.copyto(buf["pos_x"], batch.pos_x)
+        np.copyto(buf["pos_y"], batch.pos_y)
+        np.copyto(buf["angles"], batch.angles)
+        np.copyto(buf["velocity_angles"], batch.velocity_angles)
+        np.copyto(buf["alive"], batch.alive)
+        np.copyto(buf["laps"], batch.laps)
+        np.copyto(buf["checkpoint_progress"], batch.checkpoint_progress)
+        np.copyto(buf["total_checkpoints"], batch.total_checkpoints)
+        np.copyto(buf["finish_times"], self._finish_times)
+
+        self._snapshot = buf  # atomic rebind; readers see old or new, never torn
+
+    def _build_state(self, snap: dict) -> dict:
+        finish_times = snap["finish_times"]
+        # Static fields (name, color, drift) live in the start_race payload;
+        # per-tick state carries only what actually changes.
+        # Convert each array to a Python list once (C-level) instead of
+        # calling float()/int() on individual NumPy scalars per car.
+        xs = snap["pos_x"].tolist()
+        ys = snap["pos_y"].tolist()
+        angles = snap["angles"].tolist()
+        vel_angles = snap["velocity_angles"].tolist()
+        alive = snap["alive"].tolist()
+        laps = snap["laps"].tolist()
+        cps = snap["checkpoint_progress"].tolist()
+        total_cps = snap["total_checkpoints"].tolist()
         cars = []
         for i in range(len(self.racers)):
-            batch = self.car_batches[i]
             cars.append({
-                "name": self.racers[i]["name"],
-                "x": float(batch.positions[0, 0]),
-                "y": float(batch.positions[0, 1]),
-                "angle": float(batch.angles[0]),
-                "velocity_angle": float(batch.velocity_angles[0]),
-                "drift_enabled": self.car_configs[i].drift_enabled,
-                "color": self.colors[i],
-                "alive": bool(batch.alive[0]),
-                "lap": int(batch.laps[0]),
-                "checkpoint": int(batch.checkpoint_progress[0]),
-                "total_checkpoints": int(batch.total_checkpoints[0]),
+                "x": xs[i],
+                "y": ys[i],
+                "angle": angles[i],
+                "velocity_angle": vel_angles[i],
+                "alive": alive[i],
+                "lap": laps[i],
+                "checkpoint": cps[i],
+                "total_checkpoints": total_cps[i],
             })
 
-        # Build rankings
+        # Rank natively: finished first (by time), then by progress, DNF last.
+        # lexsort keys are listed minor-to-major; this replaces N Python
+        # lambda calls per sort with one native pass.
+        finished = ~np.isnan(finish_times)
+        times = np.where(finished, finish_times, 0.0)
+        dnf = ~snap["alive"] & ~finished
+        order = np.lexsort((
+            dnf,                          # DNF last
+            -snap["total_checkpoints"],   # More checkpoints = better
+            times,                        # Finishers by time
+            ~finished,                    # Finished first
+        ))
+
+        # Build rankings (index points back into the static racer metadata)
+        times_list = times.tolist()
+        dnf_list = dnf.tolist()
+        finished_list = finished.tolist()
         rankings = []
-        for i in range(len(self.racers)):
-            batch = self.car_batches[i]
-            dnf = not batch.alive[0] and i not in self._finish_times
+        for i in order.tolist():
             rankings.append({
-                "name": self.racers[i]["name"],
-                "color": self.colors[i],
-                "lap": int(batch.laps[0]),
-                "checkpoint": int(batch.total_checkpoints[0]),
-                "time": self._finish_times.get(i, 0),
-                "dnf": dnf,
-                "finished": i in self._finish_times,
+                "index": i,
+                "lap": laps[i],
+                "checkpoint": total_cps[i],
+                "time": times_list[i],
+                "dnf": dnf_list[i],
+                "finished": finished_list[i],
             })
 
-        # Sort: finished first (by time), then by progress
-        rankings.sort(
-            key=lambda r: (
-                not r["finished"],  # Finished first
-                r["time"] if r["finished"] else 0,
-                -r["checkpoint"],   # More checkpoints = better
-                r["dnf"],           # DNF last
-            )
-        )
-
         return {
             "cars": cars,
             "rankings": rankings,
-            "finished": self.finished,
-            "tick": self._tick,
+            "finished": snap["finished"],
+            "tick": snap["tick"],
         }
 
+    def _push_state(self, state: dict):
+        """Push state to JS via evaluate_js (mirrors Trainer._push_state)."""
+        if self._window is None:
+            return
+        try:
+            self._window.evaluate_js(f"window._onRaceState({_dumps(state)})")
+        except Exception:
+            pass
+
     def get_state(self) -> dict:
-        with self._lock:
-            return self._current_state.copy()
+        snap = self._snapshot  # atomic read of the published buffer
+        if snap is None:
+            return {}
+        # Repeat polls at the same tick return the memoized dict
+        if self._state_cache is not None and self._state_cache[0] == snap["tick"]:
+            return self._state_cache[1]
+        state = self._build_state(snap)
+        self._state_cache = (snap["tick"], state)
+        return state
 
     def stop(self):
         self.running = False
@@ -202,8 +438,10 @@ class RaceManager:
 
     def reset(self):
         self.stop()
-        for i, batch in enumerate(self.car_batches):
-            batch.reset(1, self.track.start_pos, self.track.start_angle)
+        if self.car_batch is not None:
+            self.car_batch.reset(
+                len(self.racers), self.track.start_pos, self.track.start_angle
+            )
         self.finished = False
         self._tick = 0
-        self._finish_times = {}
+        self._finish_times = np.full(len(self.racers), np.nan, dtype=np.float32)
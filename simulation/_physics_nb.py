@@ -0,0 +1,172 @@
+"""JIT-compiled physics kernel for the training-path CarBatch.update.
+
+The NumPy version of `update` is a dozen small array passes (steering add,
+throttle where, clip, cos/sin, the substep loop), each allocating a temp and
+paying dispatch overhead every tick. Fusing them into one native per-car loop
+walks the state arrays once and keeps the substep grass check inline, with
+per-car substep counts so slow cars do not pay for fast ones. That also
+replaced the old global substep computation — an np.any scan, an np.max
+reduction over a masked temporary and a Python ceil per tick — with one
+scalar ceil per car inside the loop. The checkpoint sweep stays in Python —
+it needs the Track's checkpoint objects.
+
+Mirrors race/_step.py: when numba is missing the plain-Python function is
+used instead — same results, just slower.
+"""
+
+import math
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is optional
+    numba = None
+
+
+def _update_kernel_impl(
+    pos_x, pos_y, angles, velocity_angles, speeds, prev_speeds,
+    alive, crashed, drift_count,
+    total_distance, max_speed_reached, speed_accumulator,
+    time_alive, stall_timer,
+    steering, throttle,
+    rotation_speed, acceleration, brake_force, max_speed, grip,
+    drift_enabled, road_mask, width, height, scale, dt, max_step_px,
+):
+    n = pos_x.shape[0]
+    killed = 0
+    for i in range(n):
+        if not alive[i]:
+            continue
+
+        prev_speeds[i] = speeds[i]
+        angles[i] += steering[i] * rotation_speed * dt
+
+        if throttle[i] > 0.0:
+            accel = throttle[i] * acceleration
+        elif throttle[i] < 0.0:
+            accel = throttle[i] * brake_force
+        else:
+            accel = 0.0
+        s = speeds[i] + accel * dt
+        if s < 0.0:
+            s = 0.0
+        elif s > max_speed:
+            s = max_speed
+        speeds[i] = s
+
+        if drift_enabled:
+            angle_diff = angles[i] - velocity_angles[i]
+            velocity_angles[i] += angle_diff * grip
+            move_angle = velocity_angles[i]
+            if abs(angle_diff) > 0.05:
+                drift_count[i] += 1
+        else:
+            velocity_angles[i] = angles[i]
+            move_angle = angles[i]
+
+        px = s * scale * dt
+        if px > 0.0:
+            dir_x = math.cos(move_angle)
+            dir_y = math.sin(move_angle)
+
+            # Per-car substeps: subdivide movement so no step exceeds
+            # max_step_px (tunneling protection), killing on grass inline.
+            # A stopped car skips this entirely — its cell was checked when
+            # it last moved.
+            substeps = int(math.ceil(px / max_step_px))
+            step = px / substeps
+            for _ in range(substeps):
+                pos_x[i] += dir_x * step
+                pos_y[i] += dir_y * step
+                ix = int(pos_x[i])
+                iy = int(pos_y[i])
+                if ix < 0 or ix >= width or iy < 0 or iy >= height or road_mask[iy, ix]:
+                    alive[i] = False
+                    crashed[i] = True
+                    killed += 1
+                    break
+
+        # Stats use start-of-tick aliveness, matching the NumPy version.
+        total_distance[i] += px
+        if s > max_speed_reached[i]:
+            max_speed_reached[i] = s
+        speed_accumulator[i] += s
+        time_alive[i] += 1
+        stall_timer[i] += 1
+    # Callers maintain CarBatch.alive_count from this.
+    return killed
+
+
+def _wall_stats_kernel_impl(
+    ray_distances, ray_length, alive,
+    wall_hits, min_wall_distance, wall_distance_accumulator,
+):
+    """One sweep over the (N, R) ray matrix: row minimum plus all three
+    wall counters, instead of separate reduction/compare/where passes."""
+    n, r = ray_distances.shape
+    for i in range(n):
+        if not alive[i]:
+            continue
+        m = ray_distances[i, 0]
+        for j in range(1, r):
+            if ray_distances[i, j] < m:
+                m = ray_distances[i, j]
+        m *= ray_length
+        if m < 5.0:
+            wall_hits[i] += 1
+        if m < min_wall_distance[i]:
+            min_wall_distance[i] = m
+        wall_distance_accumulator[i] += m
+
+
+if numba is not None:
+    update_kernel = numba.njit(cache=True, fastmath=True)(_update_kernel_impl)
+    wall_stats_kernel = numba.njit(cache=True, fastmath=True)(_wall_stats_kernel_impl)
+else:
+    update_kernel = _update_kernel_impl
+    wall_stats_kernel = _wall_stats_kernel_impl
+
+
+def warmup(config, road_mask):
+    """Trigger JIT compilation before the first real tick (dt=0 on one
+    dummy slot, so no state is touched)."""
+    import numpy as np
+
+    n = 1
+    f32 = lambda: np.zeros(n, dtype=np.float32)  # noqa: E731 - dummy rows
+    update_kernel(
+        f32(), f32(), f32(), f32(), f32(), f32(),
+        np.ones(n, dtype=bool), np.zeros(n, dtype=bool),
+        np.zeros(n, dtype=np.int32),
+        f32(), f32(), f32(),
+        np.zeros(n, dtype=np.int32), np.zeros(n, dtype=np.int32),
+        f32(), f32(),
+        1.0, 1.0, 1.0, 1.0, 1.0,
+        bool(config.drift_enabled), road_mask,
+        road_mask.shape[1], road_mask.shape[0], 0.0, 0.0, 8.0,
+    )
+    wall_stats_kernel(
+        np.ones((n, 1), dtype=np.float32), 0.0, np.zeros(n, dtype=bool),
+        np.zeros(n, dtype=np.int32), f32(), f32(),
+    )
+    from simulation.checkpoint import segments_intersect_per_car
+
+    f64 = lambda: np.zeros(n)  # noqa: E731 - gathered gates are float64
+    segments_intersect_per_car(
+        f64(), f64(), f64(), f64(), f32(), f32(), f32(), f32(),
+        np.zeros(n, dtype=bool),
+    )
+    from simulation._track_nb import is_grass_kernel, raycast_kernel
+
+    if raycast_kernel is not None:
+        packed = np.packbits(road_mask, axis=1)
+        raycast_kernel(
+            packed, np.zeros(road_mask.shape, dtype=np.float32), f32(), f32(),
+            np.zeros((n, 1), dtype=np.float32), np.zeros((n, 1), dtype=np.float32),
+            1, 2.0, 1.0, road_mask.shape[1], road_mask.shape[0],
+            np.ones((n, 1), dtype=np.float32),
+        )
+        is_grass_kernel(
+            packed, f32(), f32(),
+            road_mask.shape[1], road_mask.shape[0],
+            np.zeros(n, dtype=np.bool_),
+        )
@@ -3,6 +3,11 @@ import math
 
 import numpy as np
 
+from simulation._physics_nb import update_kernel, wall_stats_kernel
+from simulation.checkpoint import segments_intersect_per_car
+
+_INV_PI = 1.0 / math.pi
+
 
 class CarConfig:
     """Loaded from car_config.ini."""
@@ -26,6 +31,20 @@ class CarConfig:
         self.max_ticks = 2000
         self.stall_timeout = 200
         self._compute_ray_angles()
+        self._compute_inverses()
+
+    def _compute_inverses(self):
+        """Cache reciprocals used by the per-tick input normalization, so
+        the hot path multiplies instead of dividing. Also caches the ray
+        offset trig — raycast_batch combines it with the car headings via
+        the angle-addition identity instead of taking cos/sin of the full
+        (N, R) angle grid every tick."""
+        self._inv_max_speed = 1.0 / self.max_speed
+        self._inv_accel = 1.0 / max(self.acceleration, 1e-6)
+        # float32 so the (N, R) direction grids stay float32 end to end —
+        # ray lookups quantize to whole pixels, f64 precision buys nothing.
+        self._ray_cos = np.cos(self.ray_angles).astype(np.float32)
+        self._ray_sin = np.sin(self.ray_angles).astype(np.float32)
 
     def _compute_ray_angles(self):
         """Compute ray angles from count and spread."""
@@ -72,6 +91,7 @@ class CarConfig:
                 c.ray_count = len(c.ray_angles)
             else:
                 c._compute_ray_angles()
+        c._compute_inverses()
         return c
 
     @classmethod
@@ -101,6 +121,7 @@ class CarConfig:
             c.ray_count = int(d.get("ray_count", 5))
             c.ray_spread_angle = float(d.get("ray_spread_angle", 180.0))
             c._compute_ray_angles()
+        c._compute_inverses()
         return c
 
     def to_dict(self) -> dict:
@@ -135,34 +156,82 @@ class CarBatch:
 
     def _init_arrays(self, count: int):
         self.count = count
-        self.positions = np.zeros((count, 2), dtype=np.float64)
-        self.angles = np.zeros(count, dtype=np.float64)
-        self.velocity_angles = np.zeros(count, dtype=np.float64)
-        self.speeds = np.zeros(count, dtype=np.float64)
-        self.prev_speeds = np.zeros(count, dtype=np.float64)
+        # x and y live in separate contiguous arrays (SoA): axis-wise ops and
+        # the grass/ray lookups then read contiguous memory instead of the
+        # stride-2 columns of an (N, 2) layout.
+        self.pos_x = np.zeros(count, dtype=np.float32)
+        self.pos_y = np.zeros(count, dtype=np.float32)
+        self.angles = np.zeros(count, dtype=np.float32)
+        self.velocity_angles = np.zeros(count, dtype=np.float32)
+        self.speeds = np.zeros(count, dtype=np.float32)
+        self.prev_speeds = np.zeros(count, dtype=np.float32)
         self.alive = np.ones(count, dtype=bool)
-        self.fitness = np.zeros(count, dtype=np.float64)
+        # Survivor count maintained at every alive->dead transition, so
+        # per-tick liveness checks are an integer compare instead of an
+        # np.any sweep over the bool array.
+        self.alive_count = count
+        self.fitness = np.zeros(count, dtype=np.float32)
         self.checkpoint_progress = np.zeros(count, dtype=np.int32)
         self.total_checkpoints = np.zeros(count, dtype=np.int32)
         self.laps = np.zeros(count, dtype=np.int32)
         self.time_alive = np.zeros(count, dtype=np.int32)
         self.stall_timer = np.zeros(count, dtype=np.int32)
-        self.total_distance = np.zeros(count, dtype=np.float64)
-        self.max_speed_reached = np.zeros(count, dtype=np.float64)
-        self.speed_accumulator = np.zeros(count, dtype=np.float64)
+        self.total_distance = np.zeros(count, dtype=np.float32)
+        self.max_speed_reached = np.zeros(count, dtype=np.float32)
+        self.speed_accumulator = np.zeros(count, dtype=np.float32)
         self.drift_count = np.zeros(count, dtype=np.int32)
         self.crashed = np.zeros(count, dtype=bool)
         self.timed_out = np.zeros(count, dtype=bool)
         self.wall_hits = np.zeros(count, dtype=np.int32)
-        self.min_wall_distance = np.full(count, np.inf, dtype=np.float64)
-        self.wall_distance_accumulator = np.zeros(count, dtype=np.float64)
-        self.distance_to_next_cp = np.zeros(count, dtype=np.float64)
+        self.min_wall_distance = np.full(count, np.inf, dtype=np.float32)
+        self.wall_distance_accumulator = np.zeros(count, dtype=np.float32)
+        self.distance_to_next_cp = np.zeros(count, dtype=np.float32)
+        # Scratch reused every tick; fresh allocations at 60 Hz are pure
+        # allocator churn (same reasoning as the race loop's control buffers).
+        self._old_x = np.zeros(count, dtype=np.float32)
+        self._old_y = np.zeros(count, dtype=np.float32)
+        self._crossed = np.zeros(count, dtype=bool)
+        self._mask = np.zeros(count, dtype=bool)
+        self._nn_buf = None  # sized on first get_nn_inputs (needs the config)
+        self._ray_buf = None  # (count, ray_count) raycast results, same deal
+        self._ray_cos_buf = None  # ray direction grids, kept for rendering
+        self._ray_sin_buf = None
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(N, 2) view for state/debug consumers — allocates a stack, so hot
+        paths should use pos_x/pos_y directly."""
+        return np.stack([self.pos_x, self.pos_y], axis=1)
+
+    def _clear_arrays(self):
+        """Zero the existing SoA in place for a new generation. Keeps every
+        buffer (and the lazily-sized NN/ray scratch) at the same addresses,
+        so back-to-back generations reuse warm memory instead of paying a
+        full reallocation of ~25 arrays."""
+        for arr in (
+            self.speeds, self.prev_speeds, self.fitness,
+            self.checkpoint_progress, self.total_checkpoints, self.laps,
+            self.time_alive, self.stall_timer, self.total_distance,
+            self.max_speed_reached, self.speed_accumulator,
+            self.drift_count, self.crashed, self.timed_out, self.wall_hits,
+            self.wall_distance_accumulator, self.distance_to_next_cp,
+            self._old_x, self._old_y, self._crossed, self._mask,
+        ):
+            arr.fill(0)
+        self.alive.fill(True)
+        self.alive_count = self.count
+        self.min_wall_distance.fill(np.inf)
 
     def reset(self, count: int, start_pos: tuple, start_angle: float):
-        """Reset all cars to start."""
-        self._init_arrays(count)
-        self.positions[:, 0] = start_pos[0]
-        self.positions[:, 1] = start_pos[1]
+        """Reset all cars to start. When the population size is unchanged
+        (the common case between generations) the arrays are cleared in
+        place rather than reallocated."""
+        if count == self.count and count > 0:
+            self._clear_arrays()
+        else:
+            self._init_arrays(count)
+        self.pos_x[:] = start_pos[0]
+        self.pos_y[:] = start_pos[1]
         self.angles[:] = start_angle
         self.velocity_angles[:] = start_angle
 
@@ -173,6 +242,10 @@ class CarBatch:
     SPEED_SCALE = 20.0  # multiplier: config speed 10 → 200 px/sec effective
     DT = 1.0 / 60.0     # 60 ticks per second
 
+    # Substep granularity: movement is subdivided so no single step exceeds
+    # this many pixels (prevents tunneling through thin grass strips).
+    MAX_STEP_PX = 8.0
+
     def update(
         self,
         steering: np.ndarray,
@@ -180,24 +253,55 @@ class CarBatch:
         config: CarConfig,
         track=None,
     ):
-        """Vectorized physics update for all cars."""
+        """Physics update for all cars (fused native kernel when on a track)."""
+        # Once everyone is dead nothing below can change state; the kernels
+        # skip dead rows individually, so this only guards the tail case.
+        if self.alive_count == 0:
+            return
+
         dt = self.DT
         scale = self.SPEED_SCALE
-        alive_mask = self.alive.astype(np.float64)
 
-        # Store previous speeds
-        self.prev_speeds = self.speeds.copy()
+        if track is not None:
+            # Save positions before movement for checkpoint detection
+            np.copyto(self._old_x, self.pos_x)
+            np.copyto(self._old_y, self.pos_y)
+
+            # One fused pass: steering, throttle, clip, drift blend,
+            # per-car substep movement and the grass kill. Returns how many
+            # cars the grass check killed so the counter stays in sync.
+            killed = update_kernel(
+                self.pos_x, self.pos_y, self.angles, self.velocity_angles,
+                self.speeds, self.prev_speeds,
+                self.alive, self.crashed, self.drift_count,
+                self.total_distance, self.max_speed_reached,
+                self.speed_accumulator, self.time_alive, self.stall_timer,
+                steering, throttle,
+                config.rotation_speed, config.acceleration,
+                config.brake_force, config.max_speed, config.grip,
+                config.drift_enabled, track.road_mask,
+                track.width, track.height, scale, dt, self.MAX_STEP_PX,
+            )
+            self.alive_count -= int(killed)
 
-        # Apply steering (radians per second * dt)
+            # Check checkpoints once using full start->end path
+            self.check_checkpoints_sweep(track, self._old_x, self._old_y)
+            return
+
+        # No track: simple NumPy movement, no collision.
+        # Cast aliveness once and reuse — each astype walks the bool array
+        # and allocates.
+        alive_mask = self.alive.astype(np.float32)
+        alive_i32 = self.alive.astype(np.int32)
+        np.copyto(self.prev_speeds, self.speeds)
         self.angles += steering * config.rotation_speed * alive_mask * dt
 
-        # Apply throttle: acceleration is in speed-units per second
-        accel = np.where(throttle > 0, throttle * config.acceleration, 0.0)
-        brake = np.where(throttle < 0, throttle * config.brake_force, 0.0)
-        self.speeds += (accel + brake) * alive_mask * dt
-        self.speeds = np.clip(self.speeds, 0.0, config.max_speed)
+        # Accelerating and braking never overlap (throttle sign picks one),
+        # so a single coefficient select replaces the two masked temporaries.
+        coef = np.where(throttle >= 0, config.acceleration, config.brake_force)
+        self.speeds += throttle * coef * alive_mask * dt
+        np.clip(self.speeds, 0.0, config.max_speed, out=self.speeds)
 
-        # Movement: speed * scale gives pixels/sec, * dt gives pixels/tick
         if config.drift_enabled:
             angle_diff = self.angles - self.velocity_angles
             self.velocity_angles += angle_diff * config.grip
@@ -205,201 +309,171 @@ class CarBatch:
             drift_active = np.abs(angle_diff) > 0.05
             self.drift_count += (drift_active & self.alive).astype(np.int32)
         else:
-            self.velocity_angles = self.angles.copy()
+            np.copyto(self.velocity_angles, self.angles)
             move_angles = self.angles
 
-        px_per_tick = self.speeds * scale * dt  # pixels this tick
-
-        dir_x = np.cos(move_angles)
-        dir_y = np.sin(move_angles)
-
-        if track is not None:
-            # Subdivide movement to prevent tunneling through grass.
-            # Checkpoint intersection uses start->end segment, no substeps needed.
-            MAX_STEP_PX = 8.0
-            max_px = np.max(px_per_tick * alive_mask) if np.any(self.alive) else 0.0
-            substeps = max(1, int(np.ceil(max_px / MAX_STEP_PX)))
-
-            step_dx = dir_x * px_per_tick / substeps
-            step_dy = dir_y * px_per_tick / substeps
-
-            # Save positions before movement for checkpoint detection
-            old_positions = self.positions.copy()
-
-            for _ in range(substeps):
-                alive_f = self.alive.astype(np.float64)
-                self.positions[:, 0] += step_dx * alive_f
-                self.positions[:, 1] += step_dy * alive_f
-                self.check_grass(track)
+        masked_px = self.speeds * scale * dt * alive_mask  # pixels this tick
+        self.pos_x += np.cos(move_angles) * masked_px
+        self.pos_y += np.sin(move_angles) * masked_px
 
-            # Check checkpoints once using full start->end path
-            self.check_checkpoints_sweep(track.checkpoints, old_positions)
-        else:
-            # No track: simple movement, no collision
-            self.positions[:, 0] += dir_x * px_per_tick * alive_mask
-            self.positions[:, 1] += dir_y * px_per_tick * alive_mask
-
-        dx = dir_x * px_per_tick * alive_mask
-        dy = dir_y * px_per_tick * alive_mask
-
-        # Update tracking stats
-        dist = np.sqrt(dx * dx + dy * dy)
-        self.total_distance += dist
+        self.total_distance += masked_px
         self.max_speed_reached = np.maximum(self.max_speed_reached, self.speeds * alive_mask)
         self.speed_accumulator += self.speeds * alive_mask
-        self.time_alive += self.alive.astype(np.int32)
-        self.stall_timer += self.alive.astype(np.int32)
+        self.time_alive += alive_i32
+        self.stall_timer += alive_i32
 
     def check_grass(self, track):
         """Kill cars that touch grass."""
-        on_grass = track.is_grass_batch(self.positions[:, 0], self.positions[:, 1])
-        newly_dead = on_grass & self.alive
-        self.alive &= ~on_grass
+        on_grass = track.is_grass_batch(self.pos_x, self.pos_y)
+        newly_dead = np.bitwise_and(on_grass, self.alive, out=self._mask)
         self.crashed |= newly_dead
-
-    def check_checkpoints(self, checkpoints: list):
-        """Update checkpoint progress, laps, total_checkpoints."""
-        if not checkpoints:
+        self.alive_count -= int(np.count_nonzero(newly_dead))
+        # on_grass is freshly allocated per call, so invert it in place.
+        np.invert(on_grass, out=on_grass)
+        self.alive &= on_grass
+
+    def check_checkpoints_sweep(self, track, old_x: np.ndarray, old_y: np.ndarray):
+        """Check checkpoints using explicit old->new position sweep.
+
+        Each car only ever needs its *next* gate, so instead of looping over
+        checkpoints in Python we gather that gate per car from the Track's
+        SoA arrays and run one intersection kernel over all cars. This does
+        N tests total; a full (num_cps, N) broadcast matrix would remove the
+        loop too but at num_cps times the arithmetic for the same answer.
+        """
+        num_cps = track.cp_x1.shape[0]
+        if num_cps == 0:
             return
 
-        num_cps = len(checkpoints)
-        old_pos = self.positions - np.stack(
-            [np.cos(self.angles) * self.speeds, np.sin(self.angles) * self.speeds], axis=1
+        idx = self.checkpoint_progress
+        crossed = self._crossed
+        segments_intersect_per_car(
+            track.cp_x1[idx], track.cp_y1[idx],
+            track.cp_x2[idx], track.cp_y2[idx],
+            old_x, old_y, self.pos_x, self.pos_y,
+            crossed,
         )
+        advanced = np.bitwise_and(crossed, self.alive, out=crossed)
 
-        for i, cp in enumerate(checkpoints):
-            # Only check cars that need this checkpoint next
-            needs_this = (self.checkpoint_progress == i) & self.alive
-            if not np.any(needs_this):
-                continue
-
-            crossed = cp.intersects_batch(old_pos, self.positions)
-            advanced = crossed & needs_this
-
-            if np.any(advanced):
-                self.total_checkpoints += advanced.astype(np.int32)
-                self.checkpoint_progress = np.where(
-                    advanced,
-                    (self.checkpoint_progress + 1) % num_cps,
-                    self.checkpoint_progress,
-                )
-                # Check for lap completion
-                lap_done = advanced & (self.checkpoint_progress == 0)
-                self.laps += lap_done.astype(np.int32)
-                # Reset stall timer on checkpoint
-                self.stall_timer = np.where(advanced, 0, self.stall_timer)
-
-    def check_checkpoints_sweep(self, checkpoints: list, old_positions: np.ndarray):
-        """Check checkpoints using explicit old->new position sweep."""
-        if not checkpoints:
-            return
-
-        num_cps = len(checkpoints)
-
-        for i, cp in enumerate(checkpoints):
-            needs_this = (self.checkpoint_progress == i) & self.alive
-            if not np.any(needs_this):
-                continue
-
-            crossed = cp.intersects_batch(old_positions, self.positions)
-            advanced = crossed & needs_this
-
-            if np.any(advanced):
-                self.total_checkpoints += advanced.astype(np.int32)
-                self.checkpoint_progress = np.where(
-                    advanced,
-                    (self.checkpoint_progress + 1) % num_cps,
-                    self.checkpoint_progress,
-                )
-                lap_done = advanced & (self.checkpoint_progress == 0)
-                self.laps += lap_done.astype(np.int32)
-                self.stall_timer = np.where(advanced, 0, self.stall_timer)
+        if np.any(advanced):
+            self.total_checkpoints += advanced.astype(np.int32)
+            self.checkpoint_progress = np.where(advanced, (idx + 1) % num_cps, idx)
+            lap_done = np.equal(self.checkpoint_progress, 0, out=self._mask)
+            lap_done &= advanced
+            self.laps += lap_done.astype(np.int32)
+            self.stall_timer = np.where(advanced, 0, self.stall_timer)
 
     def check_stall(self, max_stall: int):
         """Kill cars stalled too long."""
-        stalled = (self.stall_timer >= max_stall) & self.alive
-        self.alive &= ~stalled
+        if self.alive_count == 0:
+            return
+        stalled = np.greater_equal(self.stall_timer, max_stall, out=self._mask)
+        stalled &= self.alive
         self.timed_out |= stalled
+        self.alive_count -= int(np.count_nonzero(stalled))
+        np.invert(stalled, out=stalled)
+        self.alive &= stalled
 
     def update_wall_stats(self, track, ray_distances: np.ndarray = None, ray_length: float = 200.0):
         """Track min/avg wall distance, wall_hits per tick.
         Uses shortest ray distance as proxy for wall distance.
         """
-        if ray_distances is None:
+        if ray_distances is None or self.alive_count == 0:
             return
 
-        alive_mask = self.alive
-        # ray_distances: (N, R), normalized 0-1. Multiply by ray_length for pixels.
-        min_ray = np.min(ray_distances, axis=1) * ray_length  # (N,) in pixels
-
-        # Wall hit = any ray < 5px
-        hit = (min_ray < 5.0) & alive_mask
-        self.wall_hits += hit.astype(np.int32)
-
-        # Min wall distance
-        alive_min_ray = np.where(alive_mask, min_ray, np.inf)
-        self.min_wall_distance = np.minimum(self.min_wall_distance, alive_min_ray)
-
-        # Accumulate for average
-        self.wall_distance_accumulator += np.where(alive_mask, min_ray, 0.0)
+        # ray_distances: (N, R), normalized 0-1. The kernel scales by
+        # ray_length and updates all three counters in one row sweep.
+        wall_stats_kernel(
+            ray_distances, ray_length, self.alive,
+            self.wall_hits, self.min_wall_distance,
+            self.wall_distance_accumulator,
+        )
 
-    def update_distance_to_cp(self, checkpoints: list):
-        """Update distance to next checkpoint center."""
-        if not checkpoints:
+    def update_distance_to_cp(self, track):
+        """Update distance to next checkpoint center (one gathered hypot)."""
+        if track.cp_mx.shape[0] == 0:
             self.distance_to_next_cp[:] = 0.0
             return
+        if self.alive_count == 0:
+            return
 
-        for i in range(self.count):
-            if not self.alive[i]:
-                continue
-            cp_idx = self.checkpoint_progress[i]
-            cp = checkpoints[cp_idx]
-            mx, my = cp.midpoint()
-            dx = self.positions[i, 0] - mx
-            dy = self.positions[i, 1] - my
-            self.distance_to_next_cp[i] = math.sqrt(dx * dx + dy * dy)
+        mx = track.cp_mx[self.checkpoint_progress]
+        my = track.cp_my[self.checkpoint_progress]
+        dist = np.hypot(self.pos_x - mx, self.pos_y - my)
+        # Dead cars keep their last value, as the Python loop did.
+        np.copyto(self.distance_to_next_cp, dist, where=self.alive)
 
     def get_nn_inputs(self, track, config: CarConfig) -> np.ndarray:
         """Build neural network inputs for all cars. Returns (N, num_inputs)."""
-        # Raycast (cached for reuse by wall stats)
-        ray_distances = track.raycast_batch(
-            self.positions, self.angles, config.ray_angles, config.ray_length
+        # Raycast only the survivors and scatter into a reused (N, R)
+        # buffer — after a few hundred ticks most slots are dead, and every
+        # downstream consumer (wall stats, rendering, the NN loop) skips
+        # dead rows anyway. Dead rows keep their last live values.
+        alive_idx = np.flatnonzero(self.alive)
+        n_rays = config.ray_angles.shape[0]
+        ray_distances = self._ray_buf
+        if ray_distances is None or ray_distances.shape != (self.count, n_rays):
+            ray_distances = self._ray_buf = np.ones(
+                (self.count, n_rays), dtype=np.float32
+            )
+        ray_distances[alive_idx] = track.raycast_batch(
+            self.pos_x[alive_idx], self.pos_y[alive_idx], self.angles[alive_idx],
+            config.ray_angles, config.ray_length,
+            config._ray_cos, config._ray_sin,
         )
         self._last_ray_distances = ray_distances
 
+        # Scatter the direction grids too, so rendering can project ray
+        # endpoints without redoing any trig.
+        if (self._ray_cos_buf is None
+                or self._ray_cos_buf.shape != (self.count, n_rays)):
+            self._ray_cos_buf = np.zeros((self.count, n_rays), dtype=np.float32)
+            self._ray_sin_buf = np.zeros((self.count, n_rays), dtype=np.float32)
+        self._ray_cos_buf[alive_idx] = track._last_cos_a
+        self._ray_sin_buf[alive_idx] = track._last_sin_a
+
+        # Fill a reused (N, num_inputs) buffer column-wise instead of
+        # hstack-ing reshaped temporaries into a fresh array every tick.
+        r = ray_distances.shape[1]
+        width = r + 4 if config.drift_enabled else r + 3
+        buf = self._nn_buf
+        if buf is None or buf.shape != (self.count, width):
+            buf = self._nn_buf = np.empty((self.count, width), dtype=np.float32)
+
+        buf[:, :r] = ray_distances
+
         # Normalize speed: [0, 1]
-        speed_norm = (self.speeds / config.max_speed).reshape(-1, 1)
+        np.multiply(self.speeds, config._inv_max_speed, out=buf[:, r])
 
         # Normalize heading: [-1, 1]
-        heading_norm = (self.angles / math.pi).reshape(-1, 1)
+        np.multiply(self.angles, _INV_PI, out=buf[:, r + 1])
 
         # Acceleration state: (speed - prev_speed) / acceleration, clamped [-1, 1]
-        accel_state = np.clip(
-            (self.speeds - self.prev_speeds) / max(config.acceleration, 1e-6),
-            -1.0, 1.0
-        ).reshape(-1, 1)
-
-        inputs = [ray_distances, speed_norm, heading_norm, accel_state]
+        np.clip(
+            (self.speeds - self.prev_speeds) * config._inv_accel,
+            -1.0, 1.0, out=buf[:, r + 2],
+        )
 
         if config.drift_enabled:
-            drift_angle = np.clip(
-                (self.angles - self.velocity_angles) / math.pi,
-                -1.0, 1.0
-            ).reshape(-1, 1)
-            inputs.append(drift_angle)
+            np.clip(
+                (self.angles - self.velocity_angles) * _INV_PI,
+                -1.0, 1.0, out=buf[:, r + 3],
+            )
 
-        return np.hstack(inputs).astype(np.float32)
+        return buf
 
     def get_state_dict(self) -> dict:
-        """Compact dict for JS rendering."""
+        """Compact dict for JS rendering. Values are the live ndarrays —
+        serializers handle them directly (orjson) or via a fallback
+        conversion, so no per-frame Python lists are materialized here."""
         return {
-            "positions": self.positions.tolist(),
-            "angles": self.angles.tolist(),
-            "velocity_angles": self.velocity_angles.tolist(),
-            "speeds": self.speeds.tolist(),
-            "alive": self.alive.tolist(),
-            "fitness": self.fitness.tolist(),
-            "checkpoint_progress": self.checkpoint_progress.tolist(),
-            "total_checkpoints": self.total_checkpoints.tolist(),
-            "laps": self.laps.tolist(),
+            "positions": self.positions,
+            "angles": self.angles,
+            "velocity_angles": self.velocity_angles,
+            "speeds": self.speeds,
+            "alive": self.alive,
+            "fitness": self.fitness,
+            "checkpoint_progress": self.checkpoint_progress,
+            "total_checkpoints": self.total_checkpoints,
+            "laps": self.laps,
         }
@@ -1,5 +1,10 @@
 import numpy as np
 
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is optional
+    numba = None
+
 
 class Checkpoint:
     """A gate defined by two endpoints (a line segment)."""
@@ -71,7 +76,8 @@ def _segments_intersect_batch(
     bx1: np.ndarray, by1: np.ndarray,
     bx2: np.ndarray, by2: np.ndarray,
 ) -> np.ndarray:
-    """Vectorized segment intersection. Gate A is scalar, segments B are arrays."""
+    """Vectorized segment intersection. Segments B are arrays; gate A may be
+    scalar or per-segment arrays (broadcasts either way)."""
     dx_a = ax2 - ax1
     dy_a = ay2 - ay1
     dx_b = bx2 - bx1
@@ -79,13 +85,53 @@ def _segments_intersect_batch(
 
     denom = dx_a * dy_b - dy_a * dx_b
 
-    safe_denom = np.where(np.abs(denom) < 1e-10, 1.0, denom)
+    # Compute validity once and reuse it both to dodge the division by ~0
+    # and to mask the result — no separate safe_denom temporary, and one
+    # reciprocal shared by t and u.
+    valid = np.abs(denom) >= 1e-10
+    inv = 1.0 / np.where(valid, denom, 1.0)
 
     dx_ab = bx1 - ax1
     dy_ab = by1 - ay1
 
-    t = (dx_ab * dy_b - dy_ab * dx_b) / safe_denom
-    u = (dx_ab * dy_a - dy_ab * dx_a) / safe_denom
+    t = (dx_ab * dy_b - dy_ab * dx_b) * inv
+    u = (dx_ab * dy_a - dy_ab * dx_a) * inv
 
-    valid = np.abs(denom) >= 1e-10
     return valid & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+
+def _segments_intersect_per_car_impl(
+    ax1, ay1, ax2, ay2, bx1, by1, bx2, by2, out,
+):
+    """Per-car gate test: segment A_i vs segment B_i, result into out[i].
+
+    The NumPy version builds ~8 N-element temporaries; this computes t, u
+    and the range checks for each pair in one pass.
+    """
+    n = bx1.shape[0]
+    for i in range(n):
+        dx_a = ax2[i] - ax1[i]
+        dy_a = ay2[i] - ay1[i]
+        dx_b = bx2[i] - bx1[i]
+        dy_b = by2[i] - by1[i]
+
+        denom = dx_a * dy_b - dy_a * dx_b
+        if abs(denom) < 1e-10:
+            out[i] = False
+            continue
+
+        dx_ab = bx1[i] - ax1[i]
+        dy_ab = by1[i] - ay1[i]
+
+        t = (dx_ab * dy_b - dy_ab * dx_b) / denom
+        u = (dx_ab * dy_a - dy_ab * dx_a) / denom
+        out[i] = 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0
+
+
+if numba is not None:
+    segments_intersect_per_car = numba.njit(cache=True, fastmath=True)(
+        _segments_intersect_per_car_impl
+    )
+else:
+    def segments_intersect_per_car(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2, out):
+        out[:] = _segments_intersect_batch(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2)
@@ -1,9 +1,27 @@
 import base64
 import io
 import json
+import math
+import zlib
 
 import numpy as np
 
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; .track falls back to JSON text
+    msgpack = None
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; mask decoding falls back to pure Python
+    Image = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is optional
+    numba = None
+
+from simulation._track_nb import edt, is_grass_kernel, raycast_kernel
 from simulation.checkpoint import Checkpoint
 
 
@@ -16,9 +34,32 @@ class Track:
         self.width = width
         self.height = height
         self.road_mask = np.ones((height, width), dtype=bool)  # All grass by default
+        # Bit-packed copy of the mask (8 cells per byte) for the per-tick
+        # lookups — 8x less memory traffic, so far more of the track stays
+        # resident in cache — plus the clearance field for ray skipping.
+        # Both rebuilt whenever road_mask is replaced.
+        self._pack_mask()
+        # Direction grids from the most recent raycast_batch call.
+        self._last_cos_a: np.ndarray | None = None
+        self._last_sin_a: np.ndarray | None = None
+        # Memoized PNG encode of road_mask, keyed on a mask checksum.
+        self._png_cache: tuple | None = None
+        # Reused raycast scratch, grown on demand; every call would
+        # otherwise allocate five fresh (N, R) arrays.
+        self._ray_scratch: dict | None = None
         self.start_pos = (100.0, 400.0)
         self.start_angle = 0.0
         self.checkpoints: list[Checkpoint] = []
+        # Packed checkpoint geometry (SoA), rebuilt whenever the checkpoint
+        # list is assigned. Gates as contiguous float64 arrays allow per-tick
+        # crossing/distance queries to gather by index instead of touching
+        # Checkpoint objects.
+        self.cp_x1 = np.empty(0)
+        self.cp_y1 = np.empty(0)
+        self.cp_x2 = np.empty(0)
+        self.cp_y2 = np.empty(0)
+        self.cp_mx = np.empty(0)
+        self.cp_my = np.empty(0)
 
     @classmethod
     def from_road_base64(cls, data: str, w: int, h: int) -> "Track":
@@ -28,6 +69,7 @@ class Track:
         img_bytes = base64.b64decode(data)
         track = cls(w, h)
         track.road_mask = _decode_mask(img_bytes, w, h)
+        track._pack_mask()
         return track
 
     @classmethod
@@ -40,6 +82,7 @@ class Track:
         if "road_mask_base64" in track_data:
             img_bytes = base64.b64decode(track_data["road_mask_base64"])
             track.road_mask = _decode_mask(img_bytes, w, h)
+            track._pack_mask()
 
         start = track_data.get("start", {})
         track.start_pos = (start.get("x", 100.0), start.get("y", 400.0))
@@ -48,12 +91,58 @@ class Track:
         track.checkpoints = []
         for i, cp_data in enumerate(track_data.get("checkpoints", [])):
             track.checkpoints.append(Checkpoint.from_dict(cp_data, index=i))
+        track._build_checkpoint_soa()
 
         return track
 
+    def _pack_mask(self):
+        """Rebuild the lookup structures derived from road_mask: the
+        bit-packed mask, and — when the jitted kernels are in use — the
+        clearance field (distance to the nearest grass pixel) that lets
+        the ray march skip across open road."""
+        self._mask_packed = np.packbits(self.road_mask, axis=1)
+        if raycast_kernel is not None:
+            self._dist_field = np.empty(self.road_mask.shape, dtype=np.float32)
+            edt(self.road_mask, self._dist_field)
+            # The march treats out-of-bounds samples as hits too, so each
+            # pixel's clearance is also bounded by its distance to the
+            # image border — without this, road painted flush to the edge
+            # lets the skip jump past the boundary crossing.
+            h, w = self.road_mask.shape
+            xs = np.arange(w, dtype=np.float32)
+            ys = np.arange(h, dtype=np.float32)
+            np.minimum(self._dist_field, np.minimum(xs + 1.0, w - xs),
+                       out=self._dist_field)
+            np.minimum(self._dist_field,
+                       np.minimum(ys + 1.0, h - ys)[:, np.newaxis],
+                       out=self._dist_field)
+        else:
+            self._dist_field = None
+
+    def _build_checkpoint_soa(self):
+        """Pack checkpoint endpoints and midpoints into flat arrays."""
+        cps = self.checkpoints
+        self.cp_x1 = np.array([cp.x1 for cp in cps], dtype=np.float64)
+        self.cp_y1 = np.array([cp.y1 for cp in cps], dtype=np.float64)
+        self.cp_x2 = np.array([cp.x2 for cp in cps], dtype=np.float64)
+        self.cp_y2 = np.array([cp.y2 for cp in cps], dtype=np.float64)
+        self.cp_mx = (self.cp_x1 + self.cp_x2) / 2
+        self.cp_my = (self.cp_y1 + self.cp_y2) / 2
+
+    def _encoded_mask(self) -> str:
+        """base64 PNG of road_mask, memoized until the pixels change.
+        Checksumming the mask is ~100x cheaper than re-encoding it, so
+        repeated saves of an unchanged track skip the PNG build."""
+        key = zlib.crc32(self.road_mask.tobytes())
+        if self._png_cache is not None and self._png_cache[0] == key:
+            return self._png_cache[1]
+        mask_b64 = _encode_mask(self.road_mask, self.width, self.height)
+        self._png_cache = (key, mask_b64)
+        return mask_b64
+
     def to_json(self) -> dict:
         """Export as .track dict."""
-        mask_b64 = _encode_mask(self.road_mask, self.width, self.height)
+        mask_b64 = self._encoded_mask()
         return {
             "version": 1,
             "width": self.width,
@@ -68,14 +157,69 @@ class Track:
         }
 
     def save(self, filepath: str):
-        with open(filepath, "w") as f:
-            json.dump(self.to_json(), f)
+        """Write a .track file.
+
+        Binary MessagePack when available: the PNG mask is stored as raw
+        bytes (no base64 inflation) and checkpoint coords as a flat float32
+        buffer, which both shrinks the file and skips text tokenizing on
+        load. Old JSON-text tracks remain loadable (format is detected by
+        the leading byte).
+        """
+        if msgpack is None:
+            with open(filepath, "w") as f:
+                json.dump(self.to_json(), f)
+            return
+
+        png_b64 = self._encoded_mask()
+        cp_coords = np.array(
+            [[cp.x1, cp.y1, cp.x2, cp.y2] for cp in self.checkpoints],
+            dtype=np.float32,
+        )
+        payload = {
+            "version": 1,
+            "width": self.width,
+            "height": self.height,
+            "road_mask_png": base64.b64decode(png_b64),
+            "start": {
+                "x": self.start_pos[0],
+                "y": self.start_pos[1],
+                "angle": self.start_angle,
+            },
+            "checkpoints_f32": cp_coords.tobytes(),
+        }
+        with open(filepath, "wb") as f:
+            f.write(msgpack.packb(payload, use_bin_type=True))
 
     @classmethod
     def load(cls, filepath: str) -> "Track":
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        return cls.from_json(data)
+        with open(filepath, "rb") as f:
+            raw = f.read()
+        # JSON-text tracks start with '{'; MessagePack maps never do
+        if raw[:1] == b"{":
+            return cls.from_json(json.loads(raw))
+        if msgpack is None:
+            raise RuntimeError(
+                f"{filepath} is a binary track file; install msgpack to load it"
+            )
+        data = msgpack.unpackb(raw, raw=False)
+
+        track = cls(data["width"], data["height"])
+        track.road_mask = _decode_mask(
+            data["road_mask_png"], data["width"], data["height"]
+        )
+        track._pack_mask()
+        start = data.get("start", {})
+        track.start_pos = (start.get("x", 100.0), start.get("y", 400.0))
+        track.start_angle = start.get("angle", 0.0)
+        coords = np.frombuffer(
+            data.get("checkpoints_f32", b""), dtype=np.float32
+        ).reshape(-1, 4)
+        track.checkpoints = [
+            Checkpoint(float(x1), float(y1), float(x2), float(y2), index=i)
+            for i, (x1, y1, x2, y2) in enumerate(coords)
+        ]
+        track._build_checkpoint_soa()
+        return track
 
     def is_grass(self, x: int, y: int) -> bool:
         """Single point check (True = death/grass)."""
@@ -86,6 +230,12 @@ class Track:
 
     def is_grass_batch(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
         """Vectorized check. Returns bool array, True = grass/death."""
+        if is_grass_kernel is not None:
+            out = np.empty(xs.shape[0], dtype=np.bool_)
+            is_grass_kernel(self._mask_packed, xs, ys, self.width, self.height, out)
+            return out
+
+        # Vectorized fallback: five (N,) temporaries per call.
         ixs = xs.astype(np.int32)
         iys = ys.astype(np.int32)
 
@@ -93,43 +243,105 @@ class Track:
         safe_xs = np.clip(ixs, 0, self.width - 1)
         safe_ys = np.clip(iys, 0, self.height - 1)
 
-        on_grass = self.road_mask[safe_ys, safe_xs]
-        return out_of_bounds | on_grass
+        byte = self._mask_packed[safe_ys, safe_xs >> 3]
+        on_grass = (byte >> (7 - (safe_xs & 7))) & 1
+        return out_of_bounds | on_grass.astype(bool)
 
     def raycast_batch(
         self,
-        positions: np.ndarray,
+        pos_x: np.ndarray,
+        pos_y: np.ndarray,
         angles: np.ndarray,
         ray_offsets: np.ndarray,
         max_length: float,
+        ray_cos: np.ndarray | None = None,
+        ray_sin: np.ndarray | None = None,
+        alive: np.ndarray | None = None,
     ) -> np.ndarray:
         """Cast rays for all cars.
-        positions: (N, 2), angles: (N,), ray_offsets: (R,), max_length: float
+        pos_x/pos_y: (N,), angles: (N,), ray_offsets: (R,), max_length: float
+        ray_cos/ray_sin: optional precomputed cos/sin of ray_offsets
+        (CarConfig caches them — the offsets never change between ticks).
+        alive: optional (N,) bool mask; dead rows are skipped and come back
+        as 1.0 (callers that pre-slice, like get_nn_inputs, don't need it).
         Returns: (N, R) distances per car per ray (normalized 0-1).
         """
-        n_cars = positions.shape[0]
+        if alive is not None:
+            idx = np.flatnonzero(alive)
+            if idx.shape[0] < pos_x.shape[0]:
+                result = np.ones(
+                    (pos_x.shape[0], ray_offsets.shape[0]), dtype=np.float32
+                )
+                result[idx] = self.raycast_batch(
+                    pos_x[idx], pos_y[idx], angles[idx],
+                    ray_offsets, max_length, ray_cos, ray_sin,
+                )
+                return result
+
+        n_cars = pos_x.shape[0]
         n_rays = ray_offsets.shape[0]
-        result = np.ones((n_cars, n_rays), dtype=np.float32)
-
-        # Compute absolute ray angles: (N, R)
-        abs_angles = angles[:, np.newaxis] + ray_offsets[np.newaxis, :]
 
-        # Ray direction vectors: (N, R)
-        cos_a = np.cos(abs_angles)
-        sin_a = np.sin(abs_angles)
+        # Scratch views into persistent buffers (callers consume or copy
+        # the results before the next call, so reuse is safe).
+        scr = self._ray_scratch
+        if (scr is None or scr["cos_a"].shape[0] < n_cars
+                or scr["cos_a"].shape[1] != n_rays):
+            scr = self._ray_scratch = {
+                "result": np.empty((n_cars, n_rays), dtype=np.float32),
+                "cos_a": np.empty((n_cars, n_rays), dtype=np.float32),
+                "sin_a": np.empty((n_cars, n_rays), dtype=np.float32),
+                "tmp": np.empty((n_cars, n_rays), dtype=np.float32),
+                "ca": np.empty((n_cars, 1), dtype=np.float32),
+                "sa": np.empty((n_cars, 1), dtype=np.float32),
+            }
+        result = scr["result"][:n_cars]
+        result.fill(1.0)
+
+        # Ray direction vectors (N, R) by the angle-addition identity:
+        # O(N + R) transcendentals plus cheap multiplies, instead of
+        # cos/sin over the full (N, R) angle grid. All in-place into the
+        # scratch buffers.
+        if ray_cos is None:
+            ray_cos = np.cos(ray_offsets).astype(np.float32)
+            ray_sin = np.sin(ray_offsets).astype(np.float32)
+        ca = np.cos(angles, out=scr["ca"][:n_cars, 0])[:, np.newaxis]
+        sa = np.sin(angles, out=scr["sa"][:n_cars, 0])[:, np.newaxis]
+        cos_a = scr["cos_a"][:n_cars]
+        sin_a = scr["sin_a"][:n_cars]
+        tmp = scr["tmp"][:n_cars]
+        np.multiply(ca, ray_cos, out=cos_a)
+        np.multiply(sa, ray_sin, out=tmp)
+        cos_a -= tmp
+        np.multiply(sa, ray_cos, out=sin_a)
+        np.multiply(ca, ray_sin, out=tmp)
+        sin_a += tmp
+        # Keep the direction grids for this call — rendering reuses them to
+        # project ray endpoints without recomputing any trig.
+        self._last_cos_a = cos_a
+        self._last_sin_a = sin_a
 
         # Step march along each ray
         step_size = 2.0
         n_steps = int(max_length / step_size)
 
+        if raycast_kernel is not None:
+            raycast_kernel(
+                self._mask_packed, self._dist_field, pos_x, pos_y, cos_a, sin_a,
+                n_steps, step_size, 1.0 / max_length,
+                self.width, self.height, result,
+            )
+            return result
+
+        # Vectorized fallback: march all rays in lockstep. Each step is a
+        # full (N, R) gather even for rays that hit long ago.
         # Track which rays still need checking
         not_hit = np.ones((n_cars, n_rays), dtype=bool)
 
         for s in range(1, n_steps + 1):
             dist = s * step_size
             # Sample points: (N, R)
-            sx = positions[:, 0:1] + cos_a * dist
-            sy = positions[:, 1:2] + sin_a * dist
+            sx = pos_x[:, np.newaxis] + cos_a * dist
+            sy = pos_y[:, np.newaxis] + sin_a * dist
 
             # Check bounds
             ix = sx.astype(np.int32)
@@ -155,6 +367,23 @@ def _decode_mask(img_bytes: bytes, w: int, h: int) -> np.ndarray:
     """Decode a PNG image to a grass mask. Road = gray (#808080), Grass = green (#4CAF50).
     Returns bool array: True = grass, False = road.
     """
+    if Image is not None:
+        # Pillow runs libpng's native unfilter/inflate path; the hand-rolled
+        # decoder below exists only for environments without it.
+        try:
+            img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+            arr = np.asarray(img)
+            is_grass = arr[:, :, 1].astype(np.int16) > arr[:, :, 0].astype(np.int16) + 20
+            img_h, img_w = is_grass.shape
+            if img_w != w or img_h != h:
+                result = np.ones((h, w), dtype=bool)
+                min_h, min_w = min(h, img_h), min(w, img_w)
+                result[:min_h, :min_w] = is_grass[:min_h, :min_w]
+                return result
+            return is_grass
+        except Exception:
+            pass  # fall through to the pure-Python decoder
+
     try:
         # Try using the raw RGBA/RGB data approach with minimal deps
         # We'll decode the PNG manually using numpy
@@ -212,6 +441,13 @@ def _decode_mask(img_bytes: bytes, w: int, h: int) -> np.ndarray:
         pixels = np.zeros((img_h, img_w, bpp), dtype=np.uint8)
 
         raw_bytes = np.frombuffer(raw, dtype=np.uint8)
+
+        if _unfilter is not None and len(raw) >= img_h * stride:
+            flat = np.empty((img_h, img_w * bpp), dtype=np.uint8)
+            _unfilter(raw_bytes, img_h, img_w, bpp, flat)
+            pixels = flat.reshape(img_h, img_w, bpp)
+            return _classify_and_fit(pixels, img_w, img_h, w, h)
+
         prev_row = np.zeros(img_w * bpp, dtype=np.uint8)
 
         for row in range(img_h):
@@ -221,57 +457,107 @@ def _decode_mask(img_bytes: bytes, w: int, h: int) -> np.ndarray:
 
             if filter_byte == 0:  # None
                 pass
-            elif filter_byte == 1:  # Sub
-                for i in range(bpp, len(row_data)):
-                    row_data[i] = (int(row_data[i]) + int(row_data[i - bpp])) & 0xFF
-            elif filter_byte == 2:  # Up
+            elif filter_byte == 2:  # Up: no left dependency, full vector op
                 row_data = (row_data.astype(np.int16) + prev_row.astype(np.int16)).astype(np.uint8)
-            elif filter_byte == 3:  # Average
-                for i in range(len(row_data)):
-                    a = int(row_data[i - bpp]) if i >= bpp else 0
-                    b = int(prev_row[i])
-                    row_data[i] = (int(row_data[i]) + (a + b) // 2) & 0xFF
-            elif filter_byte == 4:  # Paeth
-                for i in range(len(row_data)):
-                    a = int(row_data[i - bpp]) if i >= bpp else 0
-                    b = int(prev_row[i])
-                    c = int(prev_row[i - bpp]) if i >= bpp else 0
-                    p = a + b - c
-                    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
-                    if pa <= pb and pa <= pc:
-                        pr = a
-                    elif pb <= pc:
-                        pr = b
-                    else:
-                        pr = c
-                    row_data[i] = (int(row_data[i]) + pr) & 0xFF
+            elif filter_byte in (1, 3, 4):
+                # Sub/Average/Paeth recurse on the just-decoded left pixel,
+                # so the scan cannot be vectorized along the row. Plain-int
+                # list arithmetic runs the serial scan several times faster
+                # than per-element numpy scalar indexing.
+                cur = row_data.tolist()
+                prev = prev_row.tolist()
+                if filter_byte == 1:  # Sub
+                    for i in range(bpp, len(cur)):
+                        cur[i] = (cur[i] + cur[i - bpp]) & 0xFF
+                elif filter_byte == 3:  # Average
+                    for i in range(len(cur)):
+                        a = cur[i - bpp] if i >= bpp else 0
+                        cur[i] = (cur[i] + ((a + prev[i]) >> 1)) & 0xFF
+                else:  # Paeth
+                    for i in range(len(cur)):
+                        a = cur[i - bpp] if i >= bpp else 0
+                        b = prev[i]
+                        c = prev[i - bpp] if i >= bpp else 0
+                        p = a + b - c
+                        pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                        if pa <= pb and pa <= pc:
+                            pr = a
+                        elif pb <= pc:
+                            pr = b
+                        else:
+                            pr = c
+                        cur[i] = (cur[i] + pr) & 0xFF
+                row_data = np.array(cur, dtype=np.uint8)
 
             prev_row = row_data.copy()
             pixels[row] = row_data.reshape(img_w, bpp)
 
-        # Road = gray (#808080): R~128, G~128, B~128
-        # Grass = green (#4CAF50): R~76, G~175, B~80
-        # Classify: if green channel > red channel + 20 => grass
-        r = pixels[:, :, 0].astype(np.int16)
-        g = pixels[:, :, 1].astype(np.int16)
-
-        # Grass if green is significantly higher than red (green-ish)
-        # Road if R, G, B are roughly equal (gray-ish)
-        is_grass = g > (r + 20)
-
-        # Resize if needed
-        if img_w != w or img_h != h:
-            result = np.ones((h, w), dtype=bool)
-            min_h, min_w = min(h, img_h), min(w, img_w)
-            result[:min_h, :min_w] = is_grass[:min_h, :min_w]
-            return result
-
-        return is_grass
+        return _classify_and_fit(pixels, img_w, img_h, w, h)
 
     except Exception:
         return np.ones((h, w), dtype=bool)
 
 
+def _classify_and_fit(pixels: np.ndarray, img_w: int, img_h: int, w: int, h: int) -> np.ndarray:
+    """Classify decoded pixels as grass/road and pad/crop to (h, w).
+
+    Road = gray (#808080): R~128, G~128, B~128.
+    Grass = green (#4CAF50): R~76, G~175, B~80.
+    Grass if the green channel is significantly higher than red.
+    """
+    r = pixels[:, :, 0].astype(np.int16)
+    g = pixels[:, :, 1].astype(np.int16)
+    is_grass = g > (r + 20)
+
+    if img_w != w or img_h != h:
+        result = np.ones((h, w), dtype=bool)
+        min_h, min_w = min(h, img_h), min(w, img_w)
+        result[:min_h, :min_w] = is_grass[:min_h, :min_w]
+        return result
+
+    return is_grass
+
+
+def _unfilter_impl(raw, img_h, img_w, bpp, out):
+    """Undo PNG row filters into out (img_h, img_w*bpp). Compiled with numba
+    when available — the Sub/Average/Paeth cases are inherently sequential
+    per byte and crawl in the interpreter."""
+    stride = 1 + img_w * bpp
+    rowlen = img_w * bpp
+    for y in range(img_h):
+        off = y * stride
+        ft = raw[off]
+        for i in range(rowlen):
+            x = int(raw[off + 1 + i])
+            a = int(out[y, i - bpp]) if i >= bpp else 0
+            b = int(out[y - 1, i]) if y > 0 else 0
+            if ft == 1:  # Sub
+                x += a
+            elif ft == 2:  # Up
+                x += b
+            elif ft == 3:  # Average
+                x += (a + b) // 2
+            elif ft == 4:  # Paeth
+                c = int(out[y - 1, i - bpp]) if (y > 0 and i >= bpp) else 0
+                p = a + b - c
+                pa = abs(p - a)
+                pb = abs(p - b)
+                pc = abs(p - c)
+                if pa <= pb and pa <= pc:
+                    x += a
+                elif pb <= pc:
+                    x += b
+                else:
+                    x += c
+            out[y, i] = x & 0xFF
+
+
+if numba is not None:
+    _unfilter = numba.njit(cache=True)(_unfilter_impl)
+else:
+    _unfilter = None
+
+
 def _decode_raw_rgba(data: bytes, w: int, h: int) -> np.ndarray:
     """Fallback: decode raw RGBA bytes."""
     expected = w * h * 4
@@ -288,20 +574,15 @@ def _encode_mask(mask: np.ndarray, w: int, h: int) -> str:
     True (grass) = green #4CAF50, False (road) = gray #808080.
     """
     import struct
-    import zlib
-
-    # Build RGBA image
-    pixels = np.zeros((h, w, 4), dtype=np.uint8)
-    # Road (not grass): gray
-    pixels[~mask, 0] = 128  # R
-    pixels[~mask, 1] = 128  # G
-    pixels[~mask, 2] = 128  # B
-    pixels[~mask, 3] = 255  # A
-    # Grass: green
-    pixels[mask, 0] = 76   # R
-    pixels[mask, 1] = 175  # G
-    pixels[mask, 2] = 80   # B
-    pixels[mask, 3] = 255  # A
+
+    # Build RGBA image: one palette gather instead of eight boolean-index
+    # passes over the mask.
+    palette = np.array(
+        [[128, 128, 128, 255],  # road: gray
+         [76, 175, 80, 255]],   # grass: green
+        dtype=np.uint8,
+    )
+    pixels = palette[mask.astype(np.uint8)]
 
     # Build PNG manually
     def make_chunk(chunk_type: bytes, data: bytes) -> bytes:
@@ -313,13 +594,14 @@ def _encode_mask(mask: np.ndarray, w: int, h: int) -> str:
     ihdr_data = struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0)  # 8bit RGBA
     ihdr = make_chunk(b'IHDR', ihdr_data)
 
-    # IDAT
-    raw_rows = bytearray()
-    for y in range(h):
-        raw_rows.append(0)  # filter: None
-        raw_rows.extend(pixels[y].tobytes())
+    # IDAT: filter-byte column (all zeros = filter None) plus pixel rows,
+    # assembled in one contiguous buffer instead of a per-row Python loop.
+    raw_rows = np.zeros((h, 1 + w * 4), dtype=np.uint8)
+    raw_rows[:, 1:] = pixels.reshape(h, w * 4)
 
-    compressed = zlib.compress(bytes(raw_rows))
+    # Level 1: the mask is huge flat regions, so the fast encoder gives up
+    # only a few percent of ratio for a several-fold CPU saving per save.
+    compressed = zlib.compress(raw_rows.tobytes(), 1)
     idat = make_chunk(b'IDAT', compressed)
 
     # IEND
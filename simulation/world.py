@@ -1,7 +1,9 @@
+import base64
 import math
 
 import numpy as np
 
+from simulation._physics_nb import warmup
 from simulation.car import CarBatch, CarConfig
 from simulation.track import Track
 
@@ -16,6 +18,7 @@ class World:
         self.generation = 0
         self.tick = 0
         self._last_ray_distances: np.ndarray | None = None
+        warmup(car_config, track.road_mask)  # compile outside the tick budget
 
     def reset_generation(self, count: int):
         """Reset all cars to start position."""
@@ -23,24 +26,44 @@ class World:
         self.tick = 0
         self._last_ray_distances = None
 
-    def step(self, networks: list) -> bool:
-        """Execute one simulation step. Returns False when all dead or timeout."""
+    def step(self, networks) -> bool:
+        """Execute one simulation step. Returns False when all dead or
+        timeout. `networks` is either a list of per-car networks or a
+        whole-population evaluator exposing activate_batch."""
         if self.all_dead() or self.tick >= self.car_config.max_ticks:
             return False
 
         # 1. Get NN inputs
         inputs = self.cars.get_nn_inputs(self.track, self.car_config)
 
-        # 2. Feed through networks, get outputs
+        # 2. Feed through networks, get outputs.
         n = self.cars.count
-        steering = np.zeros(n, dtype=np.float64)
-        throttle = np.zeros(n, dtype=np.float64)
-
-        for i in range(n):
-            if self.cars.alive[i]:
-                output = networks[i].activate(inputs[i].tolist())
-                steering[i] = np.tanh(output[0])  # [-1, 1]
-                throttle[i] = np.tanh(output[1])  # [-1, 1]
+        activate_batch = getattr(networks, "activate_batch", None)
+        if activate_batch is not None:
+            # Whole-population evaluator (training): every network advances
+            # in one batched matmul per layer, no per-car Python calls.
+            # Dead rows are computed too — cheaper than compacting — and
+            # masked to zero so the physics sees the same inputs as the
+            # per-car path.
+            output = activate_batch(inputs)
+            steering = np.tanh(output[:, 0]).astype(np.float32)
+            throttle = np.tanh(output[:, 1]).astype(np.float32)
+            dead = ~self.cars.alive
+            steering[dead] = 0.0
+            throttle[dead] = 0.0
+        else:
+            # List of per-genome networks. Iterating the alive indices
+            # directly keeps late-generation ticks proportional to the
+            # survivor count instead of the population size.
+            steering = np.zeros(n, dtype=np.float32)
+            throttle = np.zeros(n, dtype=np.float32)
+
+            for i in np.flatnonzero(self.cars.alive):
+                # Compiled networks take the ndarray row directly; neat's
+                # pure-Python nets iterate it like any sequence.
+                output = networks[i].activate(inputs[i])
+                steering[i] = math.tanh(output[0])  # [-1, 1]
+                throttle[i] = math.tanh(output[1])  # [-1, 1]
 
         # 3. Update physics (includes substep grass + checkpoint checks)
         self.cars.update(steering, throttle, self.car_config, self.track)
@@ -49,14 +72,16 @@ class World:
         ray_distances = getattr(self.cars, '_last_ray_distances', None)
         if ray_distances is None:
             ray_distances = self.track.raycast_batch(
-                self.cars.positions, self.cars.angles,
-                self.car_config.ray_angles, self.car_config.ray_length
+                self.cars.pos_x, self.cars.pos_y, self.cars.angles,
+                self.car_config.ray_angles, self.car_config.ray_length,
+                self.car_config._ray_cos, self.car_config._ray_sin,
+                alive=self.cars.alive,
             )
         self._last_ray_distances = ray_distances
         self.cars.update_wall_stats(self.track, ray_distances, self.car_config.ray_length)
 
         # 7. Update distance to next checkpoint
-        self.cars.update_distance_to_cp(self.track.checkpoints)
+        self.cars.update_distance_to_cp(self.track)
 
         # 8. Check stall
         self.cars.check_stall(self.car_config.stall_timeout)
@@ -66,82 +91,149 @@ class World:
 
         return not self.all_dead()
 
+    def step_many(self, networks, k: int) -> bool:
+        """Run up to k steps (the trainer's speed multiplier), stopping
+        early when the generation ends. Network activation has to run
+        between physics steps, so the k-loop stays at this level rather
+        than inside a kernel — this just keeps it out of the frame loop."""
+        for _ in range(k):
+            if not self.step(networks):
+                return False
+        return True
+
     def all_dead(self) -> bool:
-        return not np.any(self.cars.alive)
+        # Integer compare on the maintained counter — called twice per tick,
+        # so the O(N) np.any sweep it replaces was pure overhead.
+        return self.cars.alive_count == 0
+
+    def get_rays(self) -> dict | None:
+        """Ray segments for rendering, packed for the bridge: a dict of
+        {"shape": (alive, R, 5), "data": base64 float32le} holding
+        [x1, y1, x2, y2, d] rows for every alive car, or None when no
+        raycast has run yet. The JS side decodes the blob into one
+        Float32Array — a third the bytes of the JSON number lists, and
+        the only Python object created per frame is the base64 string.
+
+        One vectorized pass over the alive rows instead of N*R Python math
+        calls."""
+        if self._last_ray_distances is None:
+            return None
+        alive_idx = np.flatnonzero(self.cars.alive)
+        dists = self._last_ray_distances[alive_idx]
+        dist_px = dists * self.car_config.ray_length
+        cos_buf = getattr(self.cars, '_ray_cos_buf', None)
+        if cos_buf is not None:
+            # Direction grids cached by get_nn_inputs — no trig at all.
+            # These are the headings the distances were measured along
+            # (start of tick), so endpoint and distance stay consistent.
+            cos_a = cos_buf[alive_idx]
+            sin_a = self.cars._ray_sin_buf[alive_idx]
+        else:
+            abs_ang = (self.cars.angles[alive_idx, np.newaxis]
+                       + self.car_config.ray_angles[np.newaxis, :])
+            cos_a = np.cos(abs_ang)
+            sin_a = np.sin(abs_ang)
+        x1 = np.broadcast_to(
+            self.cars.pos_x[alive_idx, np.newaxis], dists.shape)
+        y1 = np.broadcast_to(
+            self.cars.pos_y[alive_idx, np.newaxis], dists.shape)
+        packed = np.stack(
+            [x1, y1,
+             x1 + cos_a * dist_px,
+             y1 + sin_a * dist_px,
+             dists],
+            axis=-1,
+        )
+        if packed.dtype != np.float32:  # trig fallback computes in float64
+            packed = packed.astype(np.float32)
+        return {
+            "shape": packed.shape,
+            "data": base64.b64encode(packed.tobytes()).decode("ascii"),
+        }
 
     def get_state(self, include_rays: bool = True) -> dict:
         """For JS rendering."""
         state = self.cars.get_state_dict()
         state["tick"] = self.tick
         state["max_ticks"] = self.car_config.max_ticks
-
-        # Include ray endpoints only when requested and available
-        if include_rays and self._last_ray_distances is not None:
-            rays = []
-            alive = self.cars.alive
-            positions = self.cars.positions
-            angles = self.cars.angles
-            ray_angles = self.car_config.ray_angles
-            ray_len = self.car_config.ray_length
-            dists = self._last_ray_distances
-
-            for i in range(self.cars.count):
-                if alive[i]:
-                    x1 = float(positions[i, 0])
-                    y1 = float(positions[i, 1])
-                    base_angle = angles[i]
-                    car_rays = []
-                    for j in range(len(ray_angles)):
-                        angle = base_angle + ray_angles[j]
-                        d = float(dists[i, j])
-                        dist_px = d * ray_len
-                        car_rays.append([x1, y1,
-                                         x1 + math.cos(angle) * dist_px,
-                                         y1 + math.sin(angle) * dist_px, d])
-                    rays.append(car_rays)
-                else:
-                    rays.append(None)
-            state["rays"] = rays
-        else:
-            state["rays"] = None
-
+        state["rays"] = self.get_rays() if include_rays else None
         return state
 
     def build_car_stats(self) -> list:
-        """Build CarStats list from CarBatch arrays for FitnessEvaluator."""
+        """Build CarStats list from CarBatch arrays for FitnessEvaluator.
+
+        Derived quantities are whole-array expressions and each column is
+        converted to native Python with one .tolist(), so the loop just
+        zips rows into dataclasses instead of doing ~20 scalar reads and
+        casts per car."""
         from training.fitness_evaluator import CarStats
 
-        stats = []
-        for i in range(self.cars.count):
-            time_alive = max(int(self.cars.time_alive[i]), 1)
-            avg_speed = float(self.cars.speed_accumulator[i]) / time_alive
-            avg_wall_dist = float(self.cars.wall_distance_accumulator[i]) / time_alive
-
-            # Normalize distance_to_next_cp to [0, 1] range
-            max_dist = max(self.track.width, self.track.height)
-            dist_norm = min(float(self.cars.distance_to_next_cp[i]) / max_dist, 1.0)
-
-            stats.append(CarStats(
-                checkpoints_reached=int(self.cars.checkpoint_progress[i]),
-                total_checkpoints=int(self.cars.total_checkpoints[i]),
-                laps=int(self.cars.laps[i]),
-                time_alive=int(self.cars.time_alive[i]),
-                total_time=self.car_config.max_ticks,
-                total_distance=float(self.cars.total_distance[i]),
-                average_speed=avg_speed,
-                max_speed_reached=float(self.cars.max_speed_reached[i]),
-                current_speed=float(self.cars.speeds[i]),
-                distance_to_next_cp=dist_norm,
-                drift_count=int(self.cars.drift_count[i]),
-                is_alive=bool(self.cars.alive[i]),
-                crashed=bool(self.cars.crashed[i]),
-                timed_out=bool(self.cars.timed_out[i]),
-                wall_hits=int(self.cars.wall_hits[i]),
-                min_wall_distance=float(
-                    self.cars.min_wall_distance[i]
-                    if self.cars.min_wall_distance[i] != np.inf else 0.0
-                ),
-                avg_wall_distance=avg_wall_dist,
-            ))
-
-        return stats
+        c = self.cars
+        ticks = np.maximum(c.time_alive, 1)
+        avg_speed = c.speed_accumulator / ticks
+        avg_wall_dist = c.wall_distance_accumulator / ticks
+
+        # Normalize distance_to_next_cp to [0, 1] range
+        max_dist = max(self.track.width, self.track.height)
+        dist_norm = np.minimum(c.distance_to_next_cp / max_dist, 1.0)
+
+        min_wall = np.where(np.isinf(c.min_wall_distance), 0.0,
+                            c.min_wall_distance)
+        total_time = self.car_config.max_ticks
+
+        rows = zip(
+            c.checkpoint_progress.tolist(), c.total_checkpoints.tolist(),
+            c.laps.tolist(), c.time_alive.tolist(),
+            c.total_distance.tolist(), avg_speed.tolist(),
+            c.max_speed_reached.tolist(), c.speeds.tolist(),
+            dist_norm.tolist(), c.drift_count.tolist(),
+            c.alive.tolist(), c.crashed.tolist(), c.timed_out.tolist(),
+            c.wall_hits.tolist(), min_wall.tolist(), avg_wall_dist.tolist(),
+        )
+        return [
+            CarStats(cp, total_cp, laps, alive_ticks, total_time, dist,
+                     avg_sp, max_sp, speed, dist_cp, drift, alive, crashed,
+                     timed_out, hits, min_wd, avg_wd)
+            for (cp, total_cp, laps, alive_ticks, dist, avg_sp, max_sp,
+                 speed, dist_cp, drift, alive, crashed, timed_out, hits,
+                 min_wd, avg_wd) in rows
+        ]
+
+    def build_car_stats_soa(self):
+        """Stats as population-wide arrays for the vectorized fitness path.
+
+        Same derivations as build_car_stats but no per-car objects: each
+        field is handed to the evaluator as one array, so a broadcasting
+        fitness function runs without any Python-level row loop. Float
+        columns are widened to float64 to match what stacking the scalar
+        CarStats fields would have produced."""
+        from training.fitness_evaluator import _BatchCarStats
+
+        c = self.cars
+        ticks = np.maximum(c.time_alive, 1)
+        max_dist = max(self.track.width, self.track.height)
+
+        f8 = np.float64
+        return _BatchCarStats.from_arrays({
+            "checkpoints_reached": c.checkpoint_progress,
+            "total_checkpoints": c.total_checkpoints,
+            "laps": c.laps,
+            "time_alive": c.time_alive,
+            "total_time": np.full(c.count, self.car_config.max_ticks,
+                                  dtype=np.int32),
+            "total_distance": c.total_distance.astype(f8),
+            "average_speed": c.speed_accumulator.astype(f8) / ticks,
+            "max_speed_reached": c.max_speed_reached.astype(f8),
+            "current_speed": c.speeds.astype(f8),
+            "distance_to_next_cp": np.minimum(
+                c.distance_to_next_cp.astype(f8) / max_dist, 1.0),
+            "drift_count": c.drift_count,
+            "is_alive": c.alive,
+            "crashed": c.crashed,
+            "timed_out": c.timed_out,
+            "wall_hits": c.wall_hits,
+            "min_wall_distance": np.where(
+                np.isinf(c.min_wall_distance), 0.0,
+                c.min_wall_distance.astype(f8)),
+            "avg_wall_distance": c.wall_distance_accumulator.astype(f8) / ticks,
+        })
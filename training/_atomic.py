@@ -0,0 +1,22 @@
+"""Single-syscall atomic file writes.
+
+The config and export writers build their whole output in memory anyway;
+streaming it through a buffered text writer just splits it into many small
+write() calls and leaves a torn file if the process dies mid-save. Writing
+the serialized bytes with one os.write to a temp file and os.replace-ing it
+into place gives one syscall per save and all-or-nothing semantics.
+"""
+
+import os
+
+
+def write_atomic(filepath: str, payload: bytes):
+    """Write payload to filepath via a same-directory temp file + rename."""
+    tmp = filepath + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, filepath)
@@ -1,7 +1,74 @@
 import configparser
-import math
+import io
 import os
-import re
+
+from training._atomic import write_atomic
+
+
+# Parsed-INI cache keyed by path; entries invalidate when the file's
+# (mtime_ns, size) changes. The UI polls these reads per form edit, and
+# ConfigParser re-tokenizes the whole file on every call — a plain
+# line-based parse into nested dicts does the same job once.
+_ini_cache: dict = {}
+_INI_CACHE_MAX = 16
+
+_BOOL_STATES = {
+    "1": True, "yes": True, "true": True, "on": True,
+    "0": False, "no": False, "false": False, "off": False,
+}
+
+
+def _parse_ini(filepath: str) -> dict:
+    """Read an INI file into {section: {key: raw_value_str}}.
+
+    Matches ConfigParser's behavior for the subset these configs use:
+    keys lowercased, values stripped, # and ; comment lines skipped.
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _ini_cache.get(filepath)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    sections: dict = {}
+    current = None
+    with open(filepath) as f:
+        data = f.read()
+    for line in data.split("\n"):
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            current = sections.setdefault(line[1:-1], {})
+            continue
+        if current is None:
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            current[key.strip().lower()] = value.strip()
+
+    if len(_ini_cache) >= _INI_CACHE_MAX:
+        _ini_cache.pop(next(iter(_ini_cache)))
+    _ini_cache[filepath] = (stamp, sections)
+    return sections
+
+
+def _getfloat(sec: dict, key: str, default: float) -> float:
+    value = sec.get(key)
+    return float(value) if value is not None else default
+
+
+def _getint(sec: dict, key: str, default: int) -> int:
+    value = sec.get(key)
+    return int(value) if value is not None else default
+
+
+def _getbool(sec: dict, key: str, default: bool) -> bool:
+    value = sec.get(key)
+    return _BOOL_STATES[value.lower()] if value is not None else default
 
 
 class ConfigBridge:
@@ -10,30 +77,29 @@ class ConfigBridge:
     @staticmethod
     def read_car_config(filepath: str) -> dict:
         """INI -> dict for JS form."""
-        config = configparser.ConfigParser()
-        config.read(filepath)
+        config = _parse_ini(filepath)
         result = {}
         if "car" in config:
             sec = config["car"]
             result = {
                 "name": sec.get("name", "MyCar"),
-                "max_speed": sec.getfloat("max_speed", 10.0),
-                "acceleration": sec.getfloat("acceleration", 0.5),
-                "brake_force": sec.getfloat("brake_force", 0.8),
-                "rotation_speed": sec.getfloat("rotation_speed", 4.0),
-                "drift_enabled": sec.getboolean("drift_enabled", False),
-                "grip": sec.getfloat("grip", 0.7),
-                "ray_length": sec.getfloat("ray_length", 200.0),
+                "max_speed": _getfloat(sec, "max_speed", 10.0),
+                "acceleration": _getfloat(sec, "acceleration", 0.5),
+                "brake_force": _getfloat(sec, "brake_force", 0.8),
+                "rotation_speed": _getfloat(sec, "rotation_speed", 4.0),
+                "drift_enabled": _getbool(sec, "drift_enabled", False),
+                "grip": _getfloat(sec, "grip", 0.7),
+                "ray_length": _getfloat(sec, "ray_length", 200.0),
                 "car_image": sec.get("car_image", "assets/default_car.png"),
-                "max_ticks": sec.getint("max_ticks", 2000),
-                "stall_timeout": sec.getint("stall_timeout", 200),
+                "max_ticks": _getint(sec, "max_ticks", 2000),
+                "stall_timeout": _getint(sec, "stall_timeout", 200),
             }
             # Read ray_angles (or fall back to ray_count/ray_spread_angle)
             if "ray_angles" in sec:
                 result["ray_angles"] = sec.get("ray_angles")
             else:
-                count = sec.getint("ray_count", 5)
-                spread = sec.getfloat("ray_spread_angle", 180.0)
+                count = _getint(sec, "ray_count", 5)
+                spread = _getfloat(sec, "ray_spread_angle", 180.0)
                 half = spread / 2
                 if count == 1:
                     angles = [0.0]
@@ -49,37 +115,45 @@ class ConfigBridge:
         with open(filepath, "r") as f:
             content = f.read()
 
-        for key, val in values.items():
-            if isinstance(val, bool):
-                val_str = str(val)
-            else:
-                val_str = str(val)
-            # Try to replace existing key
-            pattern = rf"(?m)^{re.escape(key)}\s*=\s*.*$"
-            if re.search(pattern, content):
-                content = re.sub(pattern, f"{key} = {val_str}", content)
-            else:
-                # Append under [car] section
-                content = content.rstrip() + f"\n{key} = {val_str}\n"
-
-        # Remove old ray_count/ray_spread_angle if ray_angles is now set
-        if "ray_angles" in values:
-            content = re.sub(r"(?m)^ray_count\s*=\s*.*\n?", "", content)
-            content = re.sub(r"(?m)^ray_spread_angle\s*=\s*.*\n?", "", content)
+        # One linear pass over the lines instead of a full-buffer regex scan
+        # per key: rewrite `key = value` lines whose key is in the form
+        # values, drop the legacy ray keys when ray_angles replaces them,
+        # and append anything the file didn't already have.
+        drop_legacy = "ray_angles" in values
+        out = []
+        seen = set()
+        for line in content.split("\n"):
+            name, sep, _ = line.partition("=")
+            # name.lstrip() == name: the key starts the line, as the old
+            # ^key regex required (indented or commented lines pass through).
+            if sep and name.lstrip() == name:
+                key = name.strip()
+                if key in values:
+                    out.append(f"{key} = {values[key]}")
+                    seen.add(key)
+                    continue
+                if drop_legacy and key in ("ray_count", "ray_spread_angle"):
+                    continue
+            out.append(line)
+        missing = [k for k in values if k not in seen]
+        if missing:
+            while out and not out[-1].strip():
+                out.pop()
+            # Appends under [car] — the last section in these files.
+            out.extend(f"{k} = {values[k]}" for k in missing)
+            out.append("")
+        content = "\n".join(out)
 
-        with open(filepath, "w") as f:
-            f.write(content)
+        write_atomic(filepath, content.encode())
 
     @staticmethod
     def read_neat_config(filepath: str) -> dict:
         """INI -> dict for JS form."""
-        config = configparser.ConfigParser()
-        config.read(filepath)
-        result = {}
-        for section in config.sections():
-            for key, value in config[section].items():
-                result[f"{section}.{key}"] = value
-        return result
+        return {
+            f"{section}.{key}": value
+            for section, params in _parse_ini(filepath).items()
+            for key, value in params.items()
+        }
 
     @staticmethod
     def write_neat_config(filepath: str, values: dict):
@@ -100,8 +174,9 @@ class ConfigBridge:
                 config[section] = {}
             config[section][param] = str(value)
 
-        with open(filepath, "w") as f:
-            config.write(f)
+        buf = io.StringIO()
+        config.write(buf)
+        write_atomic(filepath, buf.getvalue().encode())
 
     @staticmethod
     def get_editable_neat_params() -> list:
@@ -185,7 +260,8 @@ class ConfigBridge:
         def _count_angles(cfg):
             angles = cfg.get("ray_angles", "")
             if isinstance(angles, str) and angles:
-                return len([a.strip() for a in angles.split(",") if a.strip()])
+                # Count non-empty tokens without materializing a list.
+                return sum(1 for a in angles.split(",") if a.strip())
             return cfg.get("ray_count", 5)
 
         new_count = _count_angles(new_config)
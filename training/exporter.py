@@ -5,6 +5,8 @@ from datetime import datetime, timezone
 import neat
 
 from simulation.car import CarConfig
+from training._atomic import write_atomic
+from training.compiled_net import CompiledNetwork
 
 
 class Exporter:
@@ -25,7 +27,7 @@ class Exporter:
             name = f"{car_config.name}_Gen{generation}"
 
         racer_data = {
-            "version": 1,
+            "version": 2,  # v2: columnar genome (one array per field)
             "name": name,
             "exported_at": datetime.now(timezone.utc).isoformat(),
             "car_config": car_config.to_dict(),
@@ -38,8 +40,9 @@ class Exporter:
 
         os.makedirs("exports", exist_ok=True)
         filepath = os.path.join("exports", f"{name}.racer")
-        with open(filepath, "w") as f:
-            json.dump(racer_data, f, indent=2)
+        # Serialize in memory first — json.dump streams many small writes
+        # for a large genome — then land the file atomically.
+        write_atomic(filepath, json.dumps(racer_data, indent=2).encode())
         return filepath
 
     @staticmethod
@@ -65,6 +68,12 @@ class Exporter:
         genome = Exporter.dict_to_genome(data["genome"], neat_config)
         network = neat.nn.FeedForwardNetwork.create(genome, neat_config)
 
+        # Compile to dense matmul layers for the per-tick race loop; keep the
+        # neat network as-is when the topology can't be vectorized.
+        compiled = CompiledNetwork.from_feedforward(network)
+        if compiled is not None:
+            network = compiled
+
         return {
             "name": data["name"],
             "car_config": car_config,
@@ -81,40 +90,58 @@ class Exporter:
 
     @staticmethod
     def genome_to_dict(genome: neat.DefaultGenome) -> dict:
-        """Serialize a NEAT genome to a JSON-compatible dict."""
-        nodes = []
-        for key, node in genome.nodes.items():
-            nodes.append({
-                "key": key,
-                "bias": node.bias,
-                "activation": node.activation,
-                "response": node.response,
-                "aggregation": node.aggregation,
-            })
-
-        connections = []
-        for key, conn in genome.connections.items():
-            connections.append({
-                "key": list(key),
-                "weight": conn.weight,
-                "enabled": conn.enabled,
-                "innovation": conn.innovation,
-            })
-
+        """Serialize a NEAT genome to a JSON-compatible dict.
+
+        Columnar layout (format 2): one list per field rather than one
+        dict per node/connection, so a large genome serializes as a
+        handful of arrays and each field name is encoded once instead of
+        thousands of times."""
+        nodes = genome.nodes
+        conns = genome.connections
         return {
             "key": genome.key,
             "fitness": genome.fitness,
-            "nodes": nodes,
-            "connections": connections,
+            "nodes": {
+                "key": list(nodes.keys()),
+                "bias": [n.bias for n in nodes.values()],
+                "activation": [n.activation for n in nodes.values()],
+                "response": [n.response for n in nodes.values()],
+                "aggregation": [n.aggregation for n in nodes.values()],
+            },
+            "connections": {
+                "key": [list(k) for k in conns.keys()],
+                "weight": [c.weight for c in conns.values()],
+                "enabled": [c.enabled for c in conns.values()],
+                "innovation": [c.innovation for c in conns.values()],
+            },
         }
 
+    @staticmethod
+    def _columnar_to_rows(cols: dict, fields: tuple) -> list:
+        """Rebuild per-item dicts from the columnar layout."""
+        return [
+            dict(zip(fields, values))
+            for values in zip(*(cols[f] for f in fields))
+        ]
+
     @staticmethod
     def dict_to_genome(data: dict, config: neat.Config) -> neat.DefaultGenome:
-        """Deserialize a genome from dict."""
+        """Deserialize a genome from dict (columnar v2 or the older
+        list-of-dicts layout)."""
         genome = neat.DefaultGenome(data["key"])
         genome.fitness = data.get("fitness")
 
-        for node_data in data["nodes"]:
+        node_rows = data["nodes"]
+        if isinstance(node_rows, dict):
+            node_rows = Exporter._columnar_to_rows(
+                node_rows,
+                ("key", "bias", "activation", "response", "aggregation"))
+        conn_rows = data["connections"]
+        if isinstance(conn_rows, dict):
+            conn_rows = Exporter._columnar_to_rows(
+                conn_rows, ("key", "weight", "enabled", "innovation"))
+
+        for node_data in node_rows:
             node = genome.create_node(config.genome_config, node_data["key"])
             node.bias = node_data["bias"]
             node.activation = node_data["activation"]
@@ -122,7 +149,7 @@ class Exporter:
             node.aggregation = node_data.get("aggregation", "sum")
             genome.nodes[node_data["key"]] = node
 
-        for i, conn_data in enumerate(data["connections"]):
+        for i, conn_data in enumerate(conn_rows):
             key = tuple(conn_data["key"])
             innovation = conn_data.get("innovation", i)
             conn = neat.genome.DefaultConnectionGene(key, innovation)
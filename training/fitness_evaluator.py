@@ -1,5 +1,12 @@
+import hashlib
+import importlib.util
+import marshal
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from training._atomic import write_atomic
 
 
 @dataclass
@@ -27,13 +34,82 @@ class CarStats:
 FITNESS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "fitness.py")
 
 
+class _BatchCarStats:
+    """CarStats fields stacked into arrays over the whole population.
+
+    Duck-types as `car` for fitness functions written with plain arithmetic:
+    NumPy broadcasting turns one call into a population-wide evaluation.
+    """
+
+    def __init__(self, stats: list = None):
+        if stats is not None:
+            for f in fields(CarStats):
+                setattr(self, f.name, np.array([getattr(s, f.name) for s in stats]))
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> "_BatchCarStats":
+        """Wrap per-field arrays directly (no per-car objects in between).
+        World.build_car_stats_soa feeds this from the CarBatch arrays."""
+        self = cls()
+        for name, arr in arrays.items():
+            setattr(self, name, arr)
+        return self
+
+    def to_rows(self) -> list:
+        """Materialize per-car CarStats — only needed when the fitness code
+        turns out not to survive array inputs."""
+        cols = [getattr(self, f.name).tolist() for f in fields(CarStats)]
+        return [CarStats(*row) for row in zip(*cols)]
+
+
+def _array_max(*args):
+    """max() that broadcasts over arrays; single-iterable form unchanged."""
+    if len(args) == 1:
+        return max(args[0])
+    out = args[0]
+    for a in args[1:]:
+        out = np.maximum(out, a)
+    return out
+
+
+def _array_min(*args):
+    if len(args) == 1:
+        return min(args[0])
+    out = args[0]
+    for a in args[1:]:
+        out = np.minimum(out, a)
+    return out
+
+
+# Names visible to user fitness code, bound once at import. The array-aware
+# max/min keep broadcasting intact when the whole population is evaluated in
+# one call; on scalars they behave like the builtins. Copied per compile so
+# globals defined by one version of the code never leak into the next.
+_FITNESS_BUILTINS = {"max": _array_max, "min": _array_min, "abs": np.abs}
+
+
 class FitnessEvaluator:
     """Loads and runs fitness function from config/fitness.py."""
 
+    __slots__ = (
+        "code", "_compiled", "_vectorizable", "_file_path",
+        "_code_digest", "_code_result", "_raw_stamp", "_raw_code",
+    )
+
     def __init__(self):
         self.code = ""
         self._compiled = None
+        # None = untested, True/False = whether the current code survives a
+        # population-wide array call (probed on the first batch evaluation)
+        self._vectorizable: bool | None = None
         self._file_path = os.path.normpath(FITNESS_FILE)
+        # Digest of the last code we validated, plus the result it produced:
+        # reloading an unchanged file skips the compile+exec+dummy-call pass.
+        self._code_digest: bytes | None = None
+        self._code_result: dict | None = None
+        # (mtime_ns, size) of the last raw read, for the get_code poll.
+        self._raw_stamp = None
+        self._raw_code = ""
         self.load_from_file()
 
     def load_from_file(self) -> dict:
@@ -51,11 +127,25 @@ class FitnessEvaluator:
 
     def _validate_and_set(self, code: str) -> dict:
         """Validate code and set as active fitness function."""
+        digest = hashlib.blake2b(code.encode(), digest_size=16).digest()
+        if digest == self._code_digest:
+            # Same code as last time — same verdict, no recompile (the
+            # compile+exec+probe pass costs tens of ms on big functions).
+            return self._code_result
+        result = self._compile_and_probe(code, digest)
+        self._code_digest = digest
+        self._code_result = result
+        return result
+
+    def _compile_and_probe(self, code: str, digest: bytes) -> dict:
         try:
-            compile(code, "<fitness>", "exec")
+            code_obj = self._load_cached_bytecode(digest)
+            if code_obj is None:
+                code_obj = compile(code, "<fitness>", "exec")
+                self._store_cached_bytecode(digest, code_obj)
 
-            namespace = {}
-            exec(code, namespace)
+            namespace = dict(_FITNESS_BUILTINS)
+            exec(code_obj, namespace)
 
             if "fitness" not in namespace:
                 return {"valid": False, "error": "File must define a 'fitness(car)' function"}
@@ -72,11 +162,14 @@ class FitnessEvaluator:
                 min_wall_distance=3.0, avg_wall_distance=10.0,
             )
             result = func(dummy)
-            if not isinstance(result, (int, float)):
+            # numpy scalars count too: the array-aware max/min/abs shims
+            # return np.int64/np.float64 even for plain-int fitness code.
+            if not isinstance(result, (int, float, np.integer, np.floating)):
                 return {"valid": False, "error": f"Must return a number, got {type(result).__name__}"}
 
             self.code = code
             self._compiled = func
+            self._vectorizable = None
             return {"valid": True}
 
         except SyntaxError as e:
@@ -84,6 +177,33 @@ class FitnessEvaluator:
         except Exception as e:
             return {"valid": False, "error": str(e)}
 
+    # Marshalled-bytecode cache next to the source file, so a fresh app
+    # start skips compile() for unchanged code. Layout: pyc magic (ties the
+    # cache to the interpreter's bytecode format) + source digest + marshal.
+    def _bytecode_cache_path(self) -> str:
+        return self._file_path + ".cache"
+
+    def _load_cached_bytecode(self, digest: bytes):
+        try:
+            with open(self._bytecode_cache_path(), "rb") as f:
+                blob = f.read()
+            magic = importlib.util.MAGIC_NUMBER
+            if (blob[:len(magic)] != magic
+                    or blob[len(magic):len(magic) + 16] != digest):
+                return None
+            return marshal.loads(blob[len(magic) + 16:])
+        except Exception:
+            return None
+
+    def _store_cached_bytecode(self, digest: bytes, code_obj):
+        try:
+            write_atomic(
+                self._bytecode_cache_path(),
+                importlib.util.MAGIC_NUMBER + digest + marshal.dumps(code_obj),
+            )
+        except Exception:  # cache is best-effort; compile still happened
+            pass
+
     def evaluate(self, car_stats: CarStats) -> float:
         """Evaluate fitness for a single car."""
         try:
@@ -92,11 +212,54 @@ class FitnessEvaluator:
         except Exception:
             return 0.0
 
+    def evaluate_batch(self, car_stats) -> np.ndarray:
+        """Evaluate the whole population in one call when possible.
+        Returns one float64 array of fitnesses, index-aligned with the
+        population.
+
+        Pure-arithmetic fitness functions broadcast over stacked arrays,
+        replacing pop_size Python calls with a single vectorized expression.
+        Code that does not survive array inputs (branching on a car field,
+        etc.) is detected once per reload and falls back to per-car calls.
+
+        Accepts either a list of CarStats or a _BatchCarStats SoA (from
+        World.build_car_stats_soa) — with the latter, the fast path never
+        touches per-car Python objects at all.
+        """
+        if isinstance(car_stats, _BatchCarStats):
+            soa = car_stats
+            n = int(soa.is_alive.shape[0])
+        else:
+            soa = None
+            n = len(car_stats)
+        if self._vectorizable is not False and self._compiled is not None:
+            try:
+                result = self._compiled(
+                    soa if soa is not None else _BatchCarStats(car_stats))
+                arr = np.asarray(result, dtype=np.float64)
+                if arr.shape == (n,):
+                    self._vectorizable = True
+                    return arr
+                self._vectorizable = False
+            except Exception:
+                self._vectorizable = False
+        if soa is not None:
+            car_stats = soa.to_rows()
+        return np.array([self.evaluate(s) for s in car_stats],
+                        dtype=np.float64)
+
     def get_code(self) -> str:
-        """Return current code (re-reads from file)."""
+        """Return current code (re-reads the file only when it changed)."""
         try:
+            st = os.stat(self._file_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == self._raw_stamp:
+                return self._raw_code
             with open(self._file_path, "r") as f:
-                return f.read()
+                code = f.read()
+            self._raw_stamp = stamp
+            self._raw_code = code
+            return code
         except Exception:
             return self.code
 
@@ -2,6 +2,7 @@ import json
 import os
 import threading
 import time
+from collections import deque
 
 import neat
 import numpy as np
@@ -9,24 +10,36 @@ import numpy as np
 from simulation.car import CarConfig
 from simulation.track import Track
 from simulation.world import World
+from training.batched_nn import BatchedPopulation
+from training.checkpointer import AsyncCheckpointer
+from training.compiled_net import CompiledNetwork
 from training.fitness_evaluator import FitnessEvaluator
 
 
-def _to_native(obj):
-    """Recursively convert numpy types to native Python types for JSON serialization."""
-    if isinstance(obj, dict):
-        return {k: _to_native(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_to_native(v) for v in obj]
-    if isinstance(obj, np.ndarray):
-        return _to_native(obj.tolist())
-    if isinstance(obj, (np.integer,)):
-        return int(obj)
-    if isinstance(obj, (np.floating,)):
-        return float(obj)
-    if isinstance(obj, (np.bool_,)):
-        return bool(obj)
-    return obj
+def _quantize(arr: np.ndarray, decimals: int) -> np.ndarray:
+    """Round state arrays to what the pixel renderer needs, through float64
+    so the JSON layer emits short decimal forms — raw float32 values pass
+    through double conversion and serialize as 17-char strings."""
+    return np.round(arr.astype(np.float64), decimals)
+
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        # OPT_SERIALIZE_NUMPY serializes the state ndarrays without first
+        # materializing Python lists.
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+except ImportError:  # pragma: no cover - orjson is optional
+    def _dumps(obj) -> str:
+        # The frame schema is fixed by _push_frame: ndarrays appear only
+        # as top-level values, and everything nested (history entries, the
+        # rays blob) is built from native types. One flat pass converts
+        # them — no recursive isinstance dispatch over every element.
+        return json.dumps(
+            {k: v.tolist() if isinstance(v, np.ndarray) else v
+             for k, v in obj.items()},
+            separators=(",", ":"))
 
 
 class Trainer:
@@ -35,16 +48,30 @@ class Trainer:
     def __init__(self):
         self.running = False
         self.paused = False
+        # Set while unpaused; paused loops block on wait() instead of
+        # polling the flag on a sleep timer.
+        self._unpaused = threading.Event()
+        self._unpaused.set()
         self.generation = 0
         self.best_fitness = 0.0
         self.best_genome = None
         self.fitness_evaluator = FitnessEvaluator()
-        self.history: list[dict] = []
+        # Only the last 100 generations are ever shown, so the deque
+        # bounds memory on long runs instead of growing one dict per
+        # generation forever.
+        self.history: deque[dict] = deque(maxlen=100)
+        # Snapshot list of the deque, rebuilt only when a generation is
+        # appended: the 60 Hz push loop reads this instead of copying the
+        # deque every frame for data that changes once per generation.
+        self._history_tail: list[dict] = []
         self.speed = 1  # Sim steps per frame (1-50)
         self.show_rays = True
 
-        self._lock = threading.Lock()
-        self._current_state: dict = {}
+        # Latest frame as its encoded JSON payload — serialized once for
+        # the push, reused verbatim by the polling fallback. Published by a
+        # single attribute store (atomic under the GIL), so readers on the
+        # UI thread never contend with the sim thread for a lock.
+        self._current_payload: str = ""
         self._window = None
         self._thread: threading.Thread | None = None
         self._population = None
@@ -55,6 +82,14 @@ class Trainer:
         self._neat_config_path: str = ""
         self._checkpoint_dir = "checkpoints"
         self._auto_checkpoint_interval = 10
+        # Direct handles to the reporters the trainer reads back from, so
+        # per-generation updates don't scan the reporter list by type.
+        self._stats_reporter = None
+        self._checkpointer = None
+        # genome_id -> (genome, network) from the previous generation.
+        # Elites are carried over as the same unmutated objects, so an
+        # identity match means the compiled network is still valid.
+        self._net_cache: dict = {}
 
     def start(self, track: Track, car_config: CarConfig, neat_config_path: str, window=None):
         """Start new training from scratch."""
@@ -82,18 +117,18 @@ class Trainer:
         # Create population
         self._population = neat.Population(self._neat_config)
         self._population.add_reporter(neat.StdOutReporter(True))
-        self._population.add_reporter(neat.StatisticsReporter())
+        self._stats_reporter = neat.StatisticsReporter()
+        self._population.add_reporter(self._stats_reporter)
 
         os.makedirs(self._checkpoint_dir, exist_ok=True)
         self._checkpoint_prefix = os.path.join(
             self._checkpoint_dir, f"{car_config.name}-gen-"
         )
-        self._population.add_reporter(
-            neat.Checkpointer(
-                generation_interval=self._auto_checkpoint_interval,
-                filename_prefix=self._checkpoint_prefix,
-            )
+        self._checkpointer = AsyncCheckpointer(
+            generation_interval=self._auto_checkpoint_interval,
+            filename_prefix=self._checkpoint_prefix,
         )
+        self._population.add_reporter(self._checkpointer)
 
         # Create world
         self._world = World(track, car_config)
@@ -102,9 +137,12 @@ class Trainer:
         self.generation = 0
         self.best_fitness = 0.0
         self.best_genome = None
-        self.history = []
+        self.history.clear()
+        self._history_tail = []
+        self._net_cache = {}
         self.running = True
         self.paused = False
+        self._unpaused.set()
 
         # Launch thread
         self._thread = threading.Thread(target=self._training_thread, daemon=True)
@@ -130,16 +168,16 @@ class Trainer:
         # Re-add reporters
         self._population.reporters.reporters.clear()
         self._population.add_reporter(neat.StdOutReporter(True))
-        self._population.add_reporter(neat.StatisticsReporter())
+        self._stats_reporter = neat.StatisticsReporter()
+        self._population.add_reporter(self._stats_reporter)
         self._checkpoint_prefix = os.path.join(
             self._checkpoint_dir, f"{car_config.name}-gen-"
         )
-        self._population.add_reporter(
-            neat.Checkpointer(
-                generation_interval=self._auto_checkpoint_interval,
-                filename_prefix=self._checkpoint_prefix,
-            )
+        self._checkpointer = AsyncCheckpointer(
+            generation_interval=self._auto_checkpoint_interval,
+            filename_prefix=self._checkpoint_prefix,
         )
+        self._population.add_reporter(self._checkpointer)
 
         self._world = World(self._track, car_config)
 
@@ -147,21 +185,28 @@ class Trainer:
         self.generation = self._population.generation
         self.best_fitness = 0.0
         self.best_genome = None
-        self.history = []
+        self.history.clear()
+        self._history_tail = []
+        self._net_cache = {}
         self.running = True
         self.paused = False
+        self._unpaused.set()
 
         self._thread = threading.Thread(target=self._training_thread, daemon=True)
         self._thread.start()
 
     def pause(self):
         self.paused = True
+        self._unpaused.clear()
 
     def unpause(self):
         self.paused = False
+        self._unpaused.set()
 
     def stop(self):
         self.running = False
+        # Wake any paused wait() so the thread can observe running=False.
+        self._unpaused.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
         self._thread = None
@@ -171,25 +216,26 @@ class Trainer:
         try:
             while self.running:
                 if self.paused:
-                    time.sleep(0.1)
+                    # Block until unpause/stop instead of waking 10x/s;
+                    # the timeout is just a safety net.
+                    self._unpaused.wait(timeout=1.0)
                     continue
                 # Run one generation
                 self._population.run(self._eval_genomes, 1)
                 self.generation = self._population.generation
 
                 # Update history
-                if self._population.reporters.reporters:
-                    for reporter in self._population.reporters.reporters:
-                        if isinstance(reporter, neat.StatisticsReporter):
-                            gen_stats = reporter.get_fitness_stat(max)
-                            avg_stats = reporter.get_fitness_mean()
-                            if gen_stats:
-                                entry = {
-                                    "gen": self.generation,
-                                    "best": gen_stats[-1] if gen_stats else 0,
-                                    "avg": avg_stats[-1] if avg_stats else 0,
-                                }
-                                self.history.append(entry)
+                if self._stats_reporter is not None:
+                    gen_stats = self._stats_reporter.get_fitness_stat(max)
+                    avg_stats = self._stats_reporter.get_fitness_mean()
+                    if gen_stats:
+                        entry = {
+                            "gen": self.generation,
+                            "best": float(gen_stats[-1]),
+                            "avg": float(avg_stats[-1]) if avg_stats else 0,
+                        }
+                        self.history.append(entry)
+                        self._history_tail = list(self.history)
         except Exception as e:
             print(f"Training error: {e}")
             import traceback
@@ -206,83 +252,148 @@ class Trainer:
         self._world.reset_generation(n)
         self._world.generation = self.generation
 
-        # Create networks
+        # Create networks, compiled to layered array form where possible so
+        # each activation is a few vector ops instead of a per-node Python
+        # walk. Topologies diverge as NEAT evolves, so nets are compiled
+        # individually — a single stacked matmul would need every genome to
+        # share a topology. Construction stays serial: it measures ~2 ms
+        # per generation (GIL-bound graph walks gain nothing from threads,
+        # and a fork pool is off-limits with the GUI's threads running).
+        # Reuse networks for genomes carried over verbatim (elitism): the
+        # check is object identity, not a topology hash — same-key genomes
+        # with mutated weights are new objects and correctly miss.
         networks = []
+        new_cache = {}
         for genome_id, genome in genomes:
-            net = neat.nn.FeedForwardNetwork.create(genome, config)
+            cached = self._net_cache.get(genome_id)
+            if cached is not None and cached[0] is genome:
+                net = cached[1]
+            else:
+                ffnet = neat.nn.FeedForwardNetwork.create(genome, config)
+                compiled = CompiledNetwork.from_feedforward(ffnet)
+                net = compiled if compiled is not None else ffnet
+            new_cache[genome_id] = (genome, net)
             networks.append(net)
-
-        # Simulation loop
+        # Replacing wholesale also evicts everything that died out.
+        self._net_cache = new_cache
+
+        # Fuse the population into one padded tensor per layer depth so
+        # each tick activates every network with a single batched matmul
+        # instead of N Python calls. Falls back to the per-genome list when
+        # any topology resisted compilation.
+        batched = BatchedPopulation.from_networks(networks)
+        if batched is not None:
+            networks = batched
+
+        # Simulation loop. Drift-corrected 60 Hz cadence like the race
+        # loop: each frame has a monotonic deadline, so time spent in the
+        # sim steps and serialization comes out of the sleep instead of
+        # stretching every frame past 16.7 ms.
         tick = 0
         max_ticks = self._car_config.max_ticks
+        frame_dt = 1.0 / 60.0
+        next_deadline = time.monotonic() + frame_dt
+        push_ok = True
 
         while self.running and tick < max_ticks:
             if self.paused:
-                time.sleep(0.1)
+                self._unpaused.wait(timeout=1.0)
+                next_deadline = time.monotonic() + frame_dt
                 continue
 
             # Run sim steps per frame
-            still_alive = True
-            for _ in range(self.speed):
-                if not self._world.step(networks):
-                    still_alive = False
-                    break
-
-            # Push state to JS via evaluate_js
-            world_state = self._world.get_state(include_rays=self.show_rays)
-            state = {
-                "cars": self._world.cars.positions.tolist(),
-                "angles": self._world.cars.angles.tolist(),
-                "velocity_angles": self._world.cars.velocity_angles.tolist(),
-                "speeds": self._world.cars.speeds.tolist(),
-                "alive": self._world.cars.alive.tolist(),
-                "fitness": self._world.cars.fitness.tolist(),
-                "rays": world_state["rays"],
-                "generation": self.generation,
-                "alive_count": int(np.sum(self._world.cars.alive)),
-                "total_count": n,
-                "best_fitness": float(self.best_fitness),
-                "species_count": len(self._population.species.species)
-                    if self._population and hasattr(self._population, 'species') else 0,
-                "tick": self._world.tick,
-                "max_ticks": max_ticks,
-                "history": self.history[-100:],
-            }
-            self._push_state(state)
+            still_alive = self._world.step_many(networks, self.speed)
+
+            if push_ok or not still_alive:
+                self._push_frame(n, max_ticks)
 
             if not still_alive:
                 break
 
             tick = self._world.tick
-            time.sleep(1.0 / 60.0)  # ~60fps
-
-        # Evaluate fitness for each genome
-        car_stats = self._world.build_car_stats()
-        for i, (genome_id, genome) in enumerate(genomes):
-            genome.fitness = self.fitness_evaluator.evaluate(car_stats[i])
-
-        # Track best
-        for genome_id, genome in genomes:
-            if genome.fitness is not None and genome.fitness > self.best_fitness:
-                self.best_fitness = genome.fitness
-                self.best_genome = genome
+            next_deadline += frame_dt
+            sleep_for = next_deadline - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+                push_ok = True
+            else:
+                # Running behind: rebase the deadline and skip at most
+                # every other push so serialization doesn't compound the
+                # backlog. The final frame always pushes.
+                next_deadline = time.monotonic()
+                push_ok = not push_ok
+
+        # The padded population tensors are dead weight once stepping ends;
+        # drop them before fitness assignment and NEAT's reproduction so
+        # they don't sit in the working set between generations. (The
+        # per-genome compiled nets stay in _net_cache on purpose — elites
+        # reuse them next generation.)
+        networks = None
+
+        # Evaluate fitness for the whole generation in one vectorized call,
+        # feeding the CarBatch arrays straight through as an SoA — no
+        # per-car CarStats objects on the fast path.
+        car_stats = self._world.build_car_stats_soa()
+        fits = self.fitness_evaluator.evaluate_batch(car_stats)
+        for fitness, (genome_id, genome) in zip(fits.tolist(), genomes):
+            genome.fitness = fitness
+
+        # Track best via argmax instead of a second Python pass.
+        best_i = int(np.argmax(fits))
+        if fits[best_i] > self.best_fitness:
+            self.best_fitness = float(fits[best_i])
+            self.best_genome = genomes[best_i][1]
+
+    def _push_frame(self, n: int, max_ticks: int):
+        """Build and push one training frame. Only the rays need the
+        World-side assembly — everything else comes straight off the
+        CarBatch arrays, which the JSON layer serializes as-is.
+
+        Quantized casts: 0.1 px positions, ~0.06 deg angles, and 2-decimal
+        speeds/fitness are below anything the canvas can show, and cut the
+        serialized payload to a fraction of the full-precision floats."""
+        world = self._world
+        cars = world.cars
+        state = {
+            "cars": _quantize(cars.positions, 1),
+            "angles": _quantize(cars.angles, 3),
+            "velocity_angles": _quantize(cars.velocity_angles, 3),
+            "speeds": _quantize(cars.speeds, 2),
+            "alive": cars.alive,
+            "fitness": _quantize(cars.fitness, 2),
+            "rays": world.get_rays() if self.show_rays else None,
+            "generation": self.generation,
+            "alive_count": cars.alive_count,
+            "total_count": n,
+            "best_fitness": float(self.best_fitness),
+            "species_count": len(self._population.species.species)
+                if self._population and hasattr(self._population, 'species') else 0,
+            "tick": world.tick,
+            "max_ticks": max_ticks,
+            "history": self._history_tail,
+        }
+        self._push_state(state)
 
     def _push_state(self, state: dict):
         """Push state to JS via evaluate_js (no polling round-trip)."""
+        payload = _dumps(state)
         if self._window is not None:
             try:
-                json_str = json.dumps(state, separators=(',', ':'))
-                self._window.evaluate_js(f"window._onTrainingState({json_str})")
+                self._window.evaluate_js(f"window._onTrainingState({payload})")
             except Exception:
                 pass
-        # Also store for get_state fallback
-        with self._lock:
-            self._current_state = state
+        # Also store for the get_state fallback — as the encoded string, so
+        # polling never re-walks the ndarrays. The plain attribute store is
+        # the publish: strings are immutable, so a reader sees either the
+        # previous complete frame or this one.
+        self._current_payload = payload
 
     def get_state(self) -> dict:
-        """Thread-safe state for JS polling (fallback)."""
-        with self._lock:
-            return self._current_state.copy()
+        """Thread-safe state for JS polling (fallback). Rehydrates the
+        already-encoded frame — pywebview serializes the return value
+        itself, and json.loads is C-level versus walking the ndarrays."""
+        payload = self._current_payload
+        return json.loads(payload) if payload else {}
 
     def save_checkpoint(self) -> str:
         """Manual checkpoint save."""
@@ -294,13 +405,12 @@ class Trainer:
             self._checkpoint_dir, f"{car_name}-gen-{self.generation}"
         )
         # Use NEAT's checkpointer
-        for reporter in self._population.reporters.reporters:
-            if isinstance(reporter, neat.Checkpointer):
-                reporter.save_checkpoint(
-                    self._population.config,
-                    self._population.population,
-                    self._population.species,
-                    self.generation,
-                )
-                return filepath
+        if self._checkpointer is not None:
+            self._checkpointer.save_checkpoint(
+                self._population.config,
+                self._population.population,
+                self._population.species,
+                self.generation,
+            )
+            return filepath
         return ""
@@ -249,34 +249,50 @@ class Renderer {
 
     drawRays(state) {
         if (!state || !state.rays || !this.showRays) return;
-        const ctx = this.ctx;
 
+        if (state.rays.data !== undefined) {
+            // Packed form: base64 float32le [nAlive, nRays, 5] of
+            // [x1, y1, x2, y2, d] rows — decode once into a Float32Array.
+            const bin = atob(state.rays.data);
+            const bytes = new Uint8Array(bin.length);
+            for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+            const flat = new Float32Array(bytes.buffer);
+            for (let o = 0; o + 4 < flat.length; o += 5) {
+                this._strokeRay(flat[o], flat[o + 1], flat[o + 2],
+                                flat[o + 3], flat[o + 4]);
+            }
+            return;
+        }
+
+        // Nested-list form (per-car arrays, null for dead cars)
         for (let i = 0; i < state.rays.length; i++) {
             const carRays = state.rays[i];
             if (!carRays) continue;
-
             for (const ray of carRays) {
-                const [x1, y1, x2, y2, normalizedDist] = ray;
-
-                // Color: green (far) -> red (close)
-                const r = Math.floor(255 * (1 - normalizedDist));
-                const g = Math.floor(255 * normalizedDist);
-                ctx.beginPath();
-                ctx.moveTo(x1, y1);
-                ctx.lineTo(x2, y2);
-                ctx.strokeStyle = `rgba(${r}, ${g}, 0, 0.4)`;
-                ctx.lineWidth = 1;
-                ctx.stroke();
-
-                // Hit point
-                ctx.beginPath();
-                ctx.arc(x2, y2, 2, 0, Math.PI * 2);
-                ctx.fillStyle = `rgb(${r}, ${g}, 0)`;
-                ctx.fill();
+                this._strokeRay(ray[0], ray[1], ray[2], ray[3], ray[4]);
             }
         }
     }
 
+    _strokeRay(x1, y1, x2, y2, normalizedDist) {
+        const ctx = this.ctx;
+        // Color: green (far) -> red (close)
+        const r = Math.floor(255 * (1 - normalizedDist));
+        const g = Math.floor(255 * normalizedDist);
+        ctx.beginPath();
+        ctx.moveTo(x1, y1);
+        ctx.lineTo(x2, y2);
+        ctx.strokeStyle = `rgba(${r}, ${g}, 0, 0.4)`;
+        ctx.lineWidth = 1;
+        ctx.stroke();
+
+        // Hit point
+        ctx.beginPath();
+        ctx.arc(x2, y2, 2, 0, Math.PI * 2);
+        ctx.fillStyle = `rgb(${r}, ${g}, 0)`;
+        ctx.fill();
+    }
+
     // === Race Mode ===
 
     drawRaceCars(cars) {
@@ -10,6 +10,12 @@ class RaceUI {
         this._pollId = null;
         this._trackData = null;
         this._trackImageLoaded = false;
+        this._pendingState = null;
+
+        // Register global receiver for Python push (no polling round-trip)
+        window._onRaceState = (state) => {
+            this._pendingState = state;
+        };
 
         this._bindControls();
     }
@@ -146,6 +152,13 @@ class RaceUI {
             );
 
             if (result.success) {
+                // Static per-racer metadata; per-tick state only carries
+                // mutable fields and is merged with this on render.
+                this._raceMeta = (result.racers || []).map(r => ({
+                    name: r.name,
+                    color: r.color,
+                    drift_enabled: !!(r.car_config && r.car_config.drift_enabled),
+                }));
                 this.isRunning = true;
                 document.getElementById('start-race-btn').style.display = 'none';
                 document.getElementById('stop-race-btn').style.display = '';
@@ -188,7 +201,12 @@ class RaceUI {
         }
 
         try {
-            const state = await pywebview.api.get_race_state();
+            // Prefer pushed state; fall back to a pull for initial sync
+            let state = this._pendingState;
+            this._pendingState = null;
+            if (!state) {
+                state = await pywebview.api.get_race_state();
+            }
             if (state && state.cars) {
                 this._renderState(state);
                 this._updateLeaderboard(state.rankings);
@@ -215,8 +233,13 @@ class RaceUI {
             this.renderer.drawCheckpoints(this._trackData.checkpoints);
         }
 
-        this.renderer.drawRaceCars(state.cars);
-        this.renderer.drawRankings(state.rankings);
+        const meta = this._raceMeta || [];
+        const cars = state.cars.map((c, i) => Object.assign({}, meta[i], c));
+        const rankings = (state.rankings || []).map(
+            r => Object.assign({}, meta[r.index], r)
+        );
+        this.renderer.drawRaceCars(cars);
+        this.renderer.drawRankings(rankings);
     }
 
     _updateLeaderboard(rankings) {
@@ -224,6 +247,8 @@ class RaceUI {
         const container = document.getElementById('race-leaderboard');
         container.innerHTML = '';
 
+        const meta = this._raceMeta || [];
+        rankings = rankings.map(r => Object.assign({}, meta[r.index], r));
         rankings.forEach((r, i) => {
             const item = document.createElement('div');
             item.className = `leaderboard-item${r.dnf ? ' dnf' : ''}`;